@@ -0,0 +1,298 @@
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.db import connection
+
+from .constant import (
+    AUTOCOMPLETE_BULK_UPDATE,
+    AUTOCOMPLETE_KEY_LENGTH,
+    AUTOCOMPLETE_LABEL_LENGTH,
+    AUTOCOMPLETE_REFRESH,
+)
+from .links import build_url
+from .models import Category, Post, User
+
+POST = "post"
+CATEGORY = "category"
+USER = "user"
+
+VIEW_NAMES = {
+    POST: "blog:post_detail",
+    CATEGORY: "blog:category_posts",
+    USER: "blog:profile",
+}
+
+
+def _keys(label):
+    """Ключи записи: название с начала каждого слова.
+
+    Ключ обрезается до AUTOCOMPLETE_KEY_LENGTH символов, чтобы длинные
+    названия не множили память; длинный префикс проверяется по названию.
+    """
+    folded = label.casefold()
+    starts = {0} | {match.start() for match in re.finditer(r"\b\w", folded)}
+    return tuple(sorted({
+        folded[start:start + AUTOCOMPLETE_KEY_LENGTH] for start in starts}))
+
+
+class AutocompleteIndex:
+    """Отсортированный список ключей для подсказок по префиксу.
+
+    Поиск — двоичный поиск по списку и просмотр соседних ключей, пока
+    они начинаются с префикса, без запросов к базе. Изменения приходят
+    из сигналов моделей; на случай правок из других процессов индекс
+    перечитывается целиком раз в AUTOCOMPLETE_REFRESH секунд. Пока идёт
+    перечитывание, запросы обслуживает прежнее содержимое, а изменения
+    из сигналов откладываются и применяются к новому.
+
+    Индекс живёт в памяти каждого процесса: на 50 000 постов это около
+    70 МиБ (tests/benchmarks/bench_autocomplete.py), больше всего уходит
+    на кортежи ключей.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = []
+        self._entries = {}
+        self._pending = None
+        self.loaded_at = None
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def key_count(self):
+        return len(self._keys)
+
+    def clear(self):
+        with self._lock:
+            self._keys = []
+            self._entries = {}
+            self._pending = None
+            self.loaded_at = None
+
+    def add(self, kind, pk, label, url_arg):
+        """Добавление или замена записи."""
+        with self._lock:
+            self._defer(self.add, kind, pk, label, url_arg)
+            self._discard(kind, pk)
+            keys = _keys(label)
+            self._entries[kind, pk] = (
+                label[:AUTOCOMPLETE_LABEL_LENGTH], url_arg, keys)
+            for key in keys:
+                insort(self._keys, (key, kind, pk))
+
+    def remove(self, kind, pk):
+        with self._lock:
+            self._defer(self.remove, kind, pk)
+            self._discard(kind, pk)
+
+    def replace(self, kind, rows, removed=()):
+        """Замена многих записей одного вида за один проход по ключам.
+
+        rows — строки (pk, label, url_arg) новых или изменённых записей,
+        removed — pk удаляемых. Начиная с AUTOCOMPLETE_BULK_UPDATE записей
+        ключи пересобираются одной сортировкой всего списка: вставка
+        каждого ключа в середину списка тогда обходится дороже.
+        """
+        rows = list(rows)
+        pks = {pk for pk, _, _ in rows}.union(removed)
+        if len(pks) < AUTOCOMPLETE_BULK_UPDATE:
+            for pk in removed:
+                self.remove(kind, pk)
+            for row in rows:
+                self.add(kind, *row)
+            return
+        with self._lock:
+            self._defer(self.replace, kind, rows, removed)
+            for pk in pks:
+                self._entries.pop((kind, pk), None)
+            keys = [
+                key for key in self._keys
+                if key[2] not in pks or key[1] != kind]
+            for pk, label, url_arg in rows:
+                entry_keys = _keys(label)
+                self._entries[kind, pk] = (
+                    label[:AUTOCOMPLETE_LABEL_LENGTH], url_arg, entry_keys)
+                keys.extend((key, kind, pk) for key in entry_keys)
+            keys.sort()
+            self._keys = keys
+
+    def _defer(self, method, *args):
+        # Изменение во время перечитывания повторяется на новом содержимом.
+        if self._pending is not None:
+            self._pending.append((method, args))
+
+    def _discard(self, kind, pk):
+        entry = self._entries.pop((kind, pk), None)
+        if entry is None:
+            return
+        for key in entry[2]:
+            index = bisect_left(self._keys, (key, kind, pk))
+            if index < len(self._keys) and self._keys[index] == (
+                    key, kind, pk):
+                del self._keys[index]
+
+    def start_reload(self):
+        """Начало перечитывания; False, если оно уже идёт."""
+        with self._lock:
+            if self._pending is not None:
+                return False
+            self._pending = []
+            return True
+
+    def load(self, rows):
+        """Полная замена содержимого строками (kind, pk, label, url_arg).
+
+        Изменения, пришедшие после start_reload, применяются
+        к новому содержимому.
+        """
+        keys = []
+        entries = {}
+        for kind, pk, label, url_arg in rows:
+            entry_keys = _keys(label)
+            entries[kind, pk] = (
+                label[:AUTOCOMPLETE_LABEL_LENGTH], url_arg, entry_keys)
+            keys.extend((key, kind, pk) for key in entry_keys)
+        keys.sort()
+        with self._lock:
+            pending, self._pending = self._pending or (), None
+            self._keys = keys
+            self._entries = entries
+            self.loaded_at = time.monotonic()
+            for method, args in pending:
+                method(*args)
+
+    def cancel_reload(self):
+        """Отмена перечитывания, которое не удалось."""
+        with self._lock:
+            self._pending = None
+
+    def lookup(self, prefix, limit):
+        """Не больше limit записей, ключ которых начинается с prefix."""
+        prefix = prefix.casefold().strip()
+        if not prefix or limit <= 0:
+            return []
+        head = prefix[:AUTOCOMPLETE_KEY_LENGTH]
+        results = []
+        seen = set()
+        with self._lock:
+            index = bisect_left(self._keys, (head,))
+            while index < len(self._keys) and len(results) < limit:
+                key, kind, pk = self._keys[index]
+                if not key.startswith(head):
+                    break
+                index += 1
+                if (kind, pk) in seen:
+                    continue
+                label, url_arg, _ = self._entries[kind, pk]
+                if len(prefix) > len(head) and prefix not in label.casefold():
+                    continue
+                seen.add((kind, pk))
+                results.append({
+                    "type": kind,
+                    "label": label,
+                    "url": build_url(VIEW_NAMES[kind], url_arg),
+                })
+        return results
+
+    def memory_usage(self):
+        """Примерный объём памяти индекса в байтах."""
+        with self._lock:
+            size = sys.getsizeof(self._keys) + sys.getsizeof(self._entries)
+            for key in self._keys:
+                size += sys.getsizeof(key) + sys.getsizeof(key[0])
+            for name, entry in self._entries.items():
+                size += sys.getsizeof(name) + sys.getsizeof(entry)
+                size += sys.getsizeof(entry[0]) + sys.getsizeof(entry[2])
+        return size
+
+
+index = AutocompleteIndex()
+
+_first_load = threading.Lock()
+
+RELOAD_THREAD_NAME = "autocomplete-reload"
+
+
+def _rows():
+    for pk, title in Post.objects.filter(is_visible=True).values_list(
+            "pk", "title").iterator():
+        yield POST, pk, title, pk
+    for pk, title, slug in Category.objects.filter(
+            is_published=True).values_list("pk", "title", "slug"):
+        yield CATEGORY, pk, title, slug
+    for pk, username in User.objects.filter(is_active=True).values_list(
+            "pk", "username").iterator():
+        yield USER, pk, username, username
+
+
+def _reload():
+    try:
+        index.load(_rows())
+    except BaseException:
+        index.cancel_reload()
+        raise
+    finally:
+        connection.close()
+
+
+def get_index():
+    """Индекс, загруженный при первом обращении и обновляемый по сроку.
+
+    Первая загрузка идёт в запросе: отдавать ещё нечего. Потом индекс
+    перечитывает фоновый поток, один на процесс, а запросы тем временем
+    читают прежнее содержимое.
+    """
+    if not index.loaded:
+        with _first_load:
+            if not index.loaded:
+                index.load(_rows())
+    elif (time.monotonic() - index.loaded_at > AUTOCOMPLETE_REFRESH
+            and index.start_reload()):
+        threading.Thread(
+            target=_reload, name=RELOAD_THREAD_NAME, daemon=True).start()
+    return index
+
+
+def update_post(post, deleted=False):
+    if not index.loaded:
+        return
+    if post.is_visible and not deleted:
+        index.add(POST, post.pk, post.title, post.pk)
+    else:
+        index.remove(POST, post.pk)
+
+
+def update_category(category, deleted=False):
+    """Категория и посты, чья видимость зависит от неё."""
+    if not index.loaded:
+        return
+    if category.is_published and not deleted:
+        index.add(CATEGORY, category.pk, category.title, category.slug)
+    else:
+        index.remove(CATEGORY, category.pk)
+    visible, hidden = [], []
+    for pk, title, is_visible in Post.objects.filter(
+            category_id=category.pk).values_list("pk", "title", "is_visible"):
+        if is_visible and not deleted:
+            visible.append((pk, title, pk))
+        else:
+            hidden.append(pk)
+    index.replace(POST, visible, hidden)
+
+
+def update_user(user, deleted=False):
+    if not index.loaded:
+        return
+    if user.is_active and not deleted:
+        index.add(USER, user.pk, user.username, user.username)
+    else:
+        index.remove(USER, user.pk)
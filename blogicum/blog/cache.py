@@ -0,0 +1,266 @@
+import hashlib
+import time
+from typing import NamedTuple, Optional
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+from .constant import (
+    CACHE_LOCK_TIMEOUT,
+    CACHE_STALE_GRACE,
+    PAGE_CACHE_TIMEOUT,
+    POST_CARD_CACHE_TIMEOUT,
+)
+
+FEED_TAG = "feed"
+
+POST_CARD_PREFIX = "post_card"
+
+
+class CachedPage(NamedTuple):
+    """Страница в кеше: тело, тип содержимого и отпечаток для ETag.
+
+    validators — пара из отпечатка содержимого и времени изменения
+    (None, если его нет), общая для всех пользователей; ETag из неё
+    собирается при ответе.
+    """
+
+    content: bytes
+    content_type: str
+    validators: Optional[tuple] = None
+
+
+def post_tag(post_id):
+    return f"post:{post_id}"
+
+
+def user_tag(user_id):
+    return f"user:{user_id}"
+
+
+def category_tag(category_id):
+    return f"category:{category_id}"
+
+
+def location_tag(location_id):
+    return f"location:{location_id}"
+
+
+def category_feed_tag(slug):
+    return f"feed:category:{slug}"
+
+
+def author_feed_tag(username):
+    return f"feed:author:{username}"
+
+
+def post_card_tags(post):
+    """Теги объектов, которые отображаются в карточке поста."""
+    tags = {post_tag(post.pk), user_tag(post.author_id)}
+    if post.category_id:
+        tags.add(category_tag(post.category_id))
+    if post.location_id:
+        tags.add(location_tag(post.location_id))
+    return tags
+
+
+def post_feed_tags(post):
+    """Теги поста и лент, в которые он входит."""
+    tags = {post_tag(post.pk), FEED_TAG, author_feed_tag(post.author.username)}
+    if post.category_id:
+        tags.add(category_feed_tag(post.category.slug))
+    return tags
+
+
+def _tag_key(tag):
+    return f"tag:{tag}"
+
+
+def get_tag_versions(tags):
+    """Текущие версии тегов; отсутствующие теги заводятся заново.
+
+    Начальная версия берётся из времени, поэтому тег, вытесненный
+    из кеша, не совпадёт со старой версией у сохранённых страниц.
+    """
+    keys = {_tag_key(tag): tag for tag in tags}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, time.time_ns(), timeout=None)
+    if len(versions) < len(keys):
+        versions = cache.get_many(keys)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def invalidate_tags(*tags):
+    """Сброс всех записей, зависящих от любого из тегов.
+
+    Новая версия — текущее время, а не прежняя версия плюс один:
+    запись целиком не зависит от чтения, и две одновременные смены
+    тега из разных процессов не дают одну и ту же версию.
+    """
+    for tag in set(tags):
+        cache.set(_tag_key(tag), time.time_ns(), timeout=None)
+
+
+def _lock_key(key):
+    return f"lock:{key}"
+
+
+def _is_fresh(entry):
+    expires = entry.get("expires")
+    if expires is not None and time.time() >= expires:
+        return False
+    versions = cache.get_many(_tag_key(tag) for tag in entry["tags"])
+    return all(
+        versions.get(_tag_key(tag)) == version
+        for tag, version in entry["tags"].items()
+    )
+
+
+def get_versioned(key):
+    """Значение записи, если ни один из её тегов не менялся.
+
+    Устаревшую запись пересчитывает один процесс: первый, кто взял
+    блокировку ключа, получает None и должен вызвать set_versioned или
+    unlock_versioned. Остальные, пока блокировка держится, получают
+    прежнее значение. Блокировка снимается сама через
+    CACHE_LOCK_TIMEOUT, если пересчитывавший процесс не справился.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if _is_fresh(entry) or not cache.add(
+            _lock_key(key), True, CACHE_LOCK_TIMEOUT):
+        return entry["value"]
+    return None
+
+
+def set_versioned(key, value, versions, timeout):
+    """Сохранение значения вместе с версиями тегов, от которых оно зависит.
+
+    Версии нужно прочитать до вычисления значения, чтобы изменение,
+    случившееся во время вычисления, не было потеряно. Запись хранится
+    на CACHE_STALE_GRACE дольше срока, чтобы после него было что отдать,
+    пока значение пересчитывается.
+    """
+    expires = None
+    if timeout is not None:
+        expires = time.time() + timeout
+        timeout += CACHE_STALE_GRACE
+    cache.set(
+        key, {"value": value, "tags": versions, "expires": expires}, timeout)
+    unlock_versioned(key)
+
+
+def get_current_versions(key):
+    """Текущие версии тегов, от которых зависит запись, или None.
+
+    Блокировку пересчёта не берёт: по версиям считаются валидаторы
+    условного запроса, и сама запись для этого не нужна.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    return get_tag_versions(entry["tags"])
+
+
+def unlock_versioned(key):
+    """Снятие блокировки пересчёта, когда значение не сохраняется."""
+    cache.delete(_lock_key(key))
+
+
+def discard_versioned(key):
+    """Удаление записи вместе с блокировкой пересчёта.
+
+    Нужно, когда пересчёт показал, что прежнее значение отдавать больше
+    нельзя: объект удалён, скрыт или страница перестала быть общей.
+    """
+    cache.delete_many((key, _lock_key(key)))
+
+
+def page_cache_key(request, params=()):
+    """Ключ кеша страницы по пути и GET-параметрам, от которых она зависит.
+
+    Прочие параметры адреса в ключ не входят и новых записей не создают.
+    """
+    query = urlencode(sorted(
+        (name, request.GET[name]) for name in params if name in request.GET))
+    path = hashlib.md5(f"{request.path}?{query}".encode()).hexdigest()
+    return f"page:{path}"
+
+
+def feed_cache_key(request):
+    """Ключ кеша XML ленты: в ленте абсолютные адреса, поэтому с хостом."""
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"feed:{url}"
+
+
+def get_cached_page(key):
+    """Сохранённая страница, если ни один из её тегов не менялся."""
+    entry = get_versioned(key)
+    if entry is None:
+        return None
+    return CachedPage(*entry)
+
+
+def set_cached_page(key, page, versions, timeout=PAGE_CACHE_TIMEOUT):
+    """Сохранение страницы вместе с версиями её тегов."""
+    set_versioned(key, tuple(page), versions, timeout)
+
+
+def feed_ids_cache_key(scope):
+    return f"feed_ids:{scope}"
+
+
+def _count(metric):
+    key = f"metric:{metric}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def _metric_keys(prefix):
+    return f"metric:{prefix}:hit", f"metric:{prefix}:miss"
+
+
+def fragment_cache_stats(prefix):
+    """Попадания и промахи кеша фрагментов с долей попаданий."""
+    hit_key, miss_key = _metric_keys(prefix)
+    counters = cache.get_many((hit_key, miss_key))
+    hits = counters.get(hit_key, 0)
+    misses = counters.get(miss_key, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "ratio": hits / total if total else 0.0,
+    }
+
+
+def reset_fragment_cache_stats(prefix):
+    cache.delete_many(_metric_keys(prefix))
+
+
+def get_post_card(post, render):
+    """HTML карточки поста из кеша или отрисованный функцией render.
+
+    Ключ включает версию тегов всего, что показано в карточке, и число
+    комментариев, поэтому устаревшая карточка просто перестаёт читаться.
+    """
+    versions = get_tag_versions(post_card_tags(post))
+    stamp = hashlib.md5(
+        repr(sorted(versions.items())).encode()).hexdigest()
+    key = (
+        f"{POST_CARD_PREFIX}:{post.pk}:{stamp}:{post.comment_count}:"
+        f"{get_language()}")
+    html = cache.get(key)
+    if html is not None:
+        _count(f"{POST_CARD_PREFIX}:hit")
+        return html
+    _count(f"{POST_CARD_PREFIX}:miss")
+    html = render()
+    cache.set(key, html, POST_CARD_CACHE_TIMEOUT)
+    return html
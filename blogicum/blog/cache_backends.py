@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class SharedFileCache(FileBasedCache):
+    """Файловый кеш, общий для всех процессов сервера.
+
+    В FileBasedCache add() сначала проверяет ключ, а потом записывает
+    его, и два процесса могут оба получить True. Здесь запись
+    появляется через os.link(), который не заменяет существующий файл,
+    поэтому блокировку пересчёта страницы получает только один процесс.
+    """
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if self.has_key(key, version):  # noqa: W601
+            return False
+        self._createdir()
+        fname = self._key_to_file(key, version)
+        self._cull()
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, "wb") as f:
+                self._write_content(f, timeout, value)
+            os.link(tmp_path, fname)
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+        return True
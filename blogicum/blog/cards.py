@@ -0,0 +1,126 @@
+from typing import NamedTuple, Optional
+
+from django.core.files.storage import default_storage
+
+from .links import build_url
+
+CARD_FIELDS = (
+    "pk",
+    "title",
+    "excerpt",
+    "pub_date",
+    "image",
+    "is_published",
+    "comment_count",
+    "author_id",
+    "author__username",
+    "category_id",
+    "category__title",
+    "category__slug",
+    "category__is_published",
+    "location_id",
+    "location__name",
+    "location__is_published",
+)
+
+
+class PostCard(NamedTuple):
+    """Данные карточки поста для лент без экземпляров моделей.
+
+    Содержит ровно то, что выводит includes/post_card.html, вместе
+    с готовыми адресами ссылок.
+    """
+
+    pk: int
+    title: str
+    excerpt: str
+    pub_date: object
+    is_published: bool
+    comment_count: int
+    author_id: int
+    author_username: str
+    category_id: Optional[int]
+    category_title: str
+    category_is_published: bool
+    location_id: Optional[int]
+    location_name: Optional[str]
+    image_url: str
+    detail_url: str
+    author_url: str
+    category_url: str
+
+    @property
+    def id(self):
+        """Первичный ключ под именем поля модели, как у поста."""
+        return self.pk
+
+    @classmethod
+    def build(
+        cls, *, pk, image, author_username, category_slug, location_name,
+        location_is_published, **fields
+    ):
+        """Карточка с посчитанными адресами и видимым местоположением."""
+        return cls(
+            pk=pk,
+            author_username=author_username,
+            location_name=location_name if location_is_published else None,
+            image_url=default_storage.url(image) if image else "",
+            detail_url=build_url("blog:post_detail", pk),
+            author_url=build_url("blog:profile", author_username),
+            category_url=(
+                build_url("blog:category_posts", category_slug)
+                if category_slug else ""),
+            **fields,
+        )
+
+    @classmethod
+    def from_values(cls, row):
+        """Карточка из строки выборки .values(*CARD_FIELDS)."""
+        return cls.build(
+            pk=row["pk"],
+            title=row["title"],
+            excerpt=row["excerpt"],
+            pub_date=row["pub_date"],
+            image=row["image"],
+            is_published=row["is_published"],
+            comment_count=row["comment_count"],
+            author_id=row["author_id"],
+            author_username=row["author__username"],
+            category_id=row["category_id"],
+            category_title=row["category__title"] or "",
+            category_slug=row["category__slug"],
+            category_is_published=bool(row["category__is_published"]),
+            location_id=row["location_id"],
+            location_name=row["location__name"],
+            location_is_published=bool(row["location__is_published"]),
+        )
+
+    @classmethod
+    def from_post(cls, post):
+        """Карточка из поста, загруженного вместе со связями."""
+        category, location = post.category, post.location
+        return cls.build(
+            pk=post.pk,
+            title=post.title,
+            excerpt=post.excerpt,
+            pub_date=post.pub_date,
+            image=post.image.name,
+            is_published=post.is_published,
+            comment_count=post.comment_count,
+            author_id=post.author_id,
+            author_username=post.author.username,
+            category_id=post.category_id,
+            category_title=category.title if category else "",
+            category_slug=category.slug if category else None,
+            category_is_published=bool(category and category.is_published),
+            location_id=post.location_id,
+            location_name=location.name if location else None,
+            location_is_published=bool(location and location.is_published),
+        )
+
+
+def as_card(post):
+    """Карточка для поста или уже готовая карточка."""
+    if isinstance(post, PostCard):
+        return post
+    return PostCard.from_post(post)
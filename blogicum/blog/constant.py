@@ -2,6 +2,61 @@ MAX_LENGHT_TEXT = 256
 
 MAX_LENGHT_COMMENT = 250
 
+MAX_LENGHT_EXCERPT = 256
+
+EXCERPT_WORDS = 10
+
 POST_OUTPUT_LIM = 5
 
 COUNT_POSTS_ON_FRAME = 10
+
+POST_ORDERING = ('-pub_date', '-id')
+
+COMMENT_ORDERING = ('created_at', 'id')
+
+COMMENTS_PER_PAGE = 20
+
+RECOUNT_BATCH_SIZE = 1000
+
+PAGE_CACHE_TIMEOUT = 60 * 60
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+FEED_IDS_CACHE_TIMEOUT = 60 * 60
+
+CACHE_LOCK_TIMEOUT = 30
+
+CACHE_STALE_GRACE = 60 * 5
+
+PUBLIC_CACHE_MAX_AGE = 60
+
+PUBLIC_CACHE_STALE = 60 * 10
+
+PUBLIC_CACHE_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+    'pages:about',
+    'pages:rules',
+)
+
+COUNT_APPROXIMATE_LIMIT = 10000
+
+PAGES_ON_EACH_SIDE = 2
+
+PAGES_ON_ENDS = 1
+
+SCHEDULER_INTERVAL = 60
+
+AUTOCOMPLETE_LIMIT = 10
+
+AUTOCOMPLETE_KEY_LENGTH = 32
+
+AUTOCOMPLETE_LABEL_LENGTH = 80
+
+AUTOCOMPLETE_REFRESH = 60 * 5
+
+AUTOCOMPLETE_BULK_UPDATE = 200
+
+FEED_ITEMS = 20
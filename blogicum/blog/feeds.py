@@ -0,0 +1,138 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.utils.feedgenerator import Atom1Feed
+
+from .cache import FEED_TAG, author_feed_tag, category_feed_tag
+from .constant import FEED_ITEMS, POST_ORDERING
+from .links import build_url
+from .models import Category, Post, User
+
+
+class PostFeed(Feed):
+    """RSS-лента опубликованных постов с сохранёнными отрывками.
+
+    Записи ленты — карточки PostCard из одного запроса .values();
+    экземпляр создаётся на каждый запрос и запоминает выданные карточки,
+    чтобы представление знало теги кеша.
+    """
+
+    def __init__(self):
+        self.cards = []
+
+    @staticmethod
+    def get_scope(**url_kwargs):
+        """Все посты ленты без учёта видимости."""
+        return Post.objects.all()
+
+    @staticmethod
+    def get_cache_tags(**url_kwargs):
+        """Теги, известные по адресу ленты."""
+        return {FEED_TAG}
+
+    def title(self, obj):
+        return "Блогикум"
+
+    def description(self, obj):
+        return "Новые публикации всех авторов."
+
+    def link(self, obj):
+        return build_url("blog:index")
+
+    def items(self, obj):
+        self.cards = self.get_scope(**self.url_kwargs).published().order_by(
+            *POST_ORDERING)[:FEED_ITEMS].cards()
+        return self.cards
+
+    def get_object(self, request, *args, **kwargs):
+        self.url_kwargs = kwargs
+        return None
+
+    def item_title(self, card):
+        return card.title
+
+    def item_description(self, card):
+        return card.excerpt
+
+    def item_link(self, card):
+        return card.detail_url
+
+    def item_pubdate(self, card):
+        return card.pub_date
+
+    def item_author_name(self, card):
+        return card.author_username
+
+    def item_categories(self, card):
+        return (card.category_title,) if card.category_title else ()
+
+
+class CategoryPostFeed(PostFeed):
+    """RSS-лента опубликованных постов категории."""
+
+    @staticmethod
+    def get_scope(category_slug):
+        return Post.objects.filter(category__slug=category_slug)
+
+    @staticmethod
+    def get_cache_tags(category_slug):
+        return {category_feed_tag(category_slug)}
+
+    def get_object(self, request, category_slug):
+        super().get_object(request, category_slug=category_slug)
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True)
+
+    def title(self, category):
+        return f"Блогикум: {category.title}"
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return category.get_absolute_url()
+
+
+class AuthorPostFeed(PostFeed):
+    """RSS-лента опубликованных постов автора."""
+
+    @staticmethod
+    def get_scope(username):
+        return Post.objects.filter(author__username=username)
+
+    @staticmethod
+    def get_cache_tags(username):
+        return {author_feed_tag(username)}
+
+    def get_object(self, request, username):
+        super().get_object(request, username=username)
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f"Блогикум: @{author.username}"
+
+    def description(self, author):
+        return f"Публикации пользователя @{author.username}."
+
+    def link(self, author):
+        return build_url("blog:profile", author.username)
+
+
+class AtomFeedMixin:
+    """Та же лента в формате Atom."""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class PostAtomFeed(AtomFeedMixin, PostFeed):
+    """Atom-лента опубликованных постов."""
+
+
+class CategoryPostAtomFeed(AtomFeedMixin, CategoryPostFeed):
+    """Atom-лента опубликованных постов категории."""
+
+
+class AuthorPostAtomFeed(AtomFeedMixin, AuthorPostFeed):
+    """Atom-лента опубликованных постов автора."""
@@ -0,0 +1,38 @@
+import re
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.urls import get_script_prefix, reverse
+
+# Символы, которые reverse() оставляет в аргументах без экранирования.
+URL_SAFE = "!$&'()*+,;=/~:@"
+
+_MARKER_BASE = 10 ** 17
+
+
+@lru_cache(maxsize=None)
+def _url_template(script_prefix, viewname, arity):
+    """Куски адреса между аргументами и порядок аргументов в нём.
+
+    Адрес один раз строится через reverse() с метками вместо аргументов;
+    script_prefix входит в ключ кеша, потому что reverse() его учитывает.
+    """
+    markers = [str(_MARKER_BASE + index) for index in range(arity)]
+    path = reverse(viewname, args=markers)
+    pieces = re.split(f"({'|'.join(markers)})", path) if markers else [path]
+    return tuple(pieces[::2]), tuple(
+        markers.index(marker) for marker in pieces[1::2])
+
+
+def build_url(viewname, *args):
+    """То же, что reverse(viewname, args=args), без обхода резолвера.
+
+    Аргументы не проверяются конвертерами маршрута, поэтому функция
+    подходит только для значений из базы: id, slug, имени пользователя.
+    """
+    pieces, order = _url_template(get_script_prefix(), viewname, len(args))
+    parts = [pieces[0]]
+    for piece, index in zip(pieces[1:], order):
+        parts.append(quote(str(args[index]), safe=URL_SAFE))
+        parts.append(piece)
+    return "".join(parts)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.autocomplete import get_index
+
+
+class Command(BaseCommand):
+    """Размер индекса подсказок."""
+
+    help = (
+        "Загружает индекс подсказок и выводит число записей "
+        "и занимаемую им память."
+    )
+
+    def handle(self, *args, **options):
+        index = get_index()
+        self.stdout.write(
+            f"Записей: {len(index)}, ключей: {index.key_count}, "
+            f"память: {index.memory_usage() / 1024:.1f} КиБ")
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache import invalidate_tags, post_tag
+from blog.constant import RECOUNT_BATCH_SIZE
+from blog.models import Post
+from blog.utils import make_excerpt
+
+
+class Command(BaseCommand):
+    """Пересчёт отрывков текста у всех публикаций."""
+
+    help = "Заполняет Post.excerpt пачками по первичному ключу."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=RECOUNT_BATCH_SIZE,
+            help="Количество публикаций в одной транзакции.")
+
+    def handle(self, *args, batch_size, **options):
+        last_id = 0
+        updated = 0
+        while True:
+            posts = list(
+                Post.objects.filter(pk__gt=last_id).order_by("pk")
+                .only("pk", "text", "excerpt")[:batch_size]
+            )
+            if not posts:
+                break
+            changed = []
+            for post in posts:
+                excerpt = make_excerpt(post.text)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    changed.append(post)
+            with transaction.atomic():
+                Post.objects.bulk_update(changed, ["excerpt"])
+            invalidate_tags(*(post_tag(post.pk) for post in changed))
+            updated += len(changed)
+            last_id = posts[-1].pk
+        self.stdout.write(f"Обновлено отрывков: {updated}")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import (
+    POST_CARD_PREFIX,
+    fragment_cache_stats,
+    reset_fragment_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    """Статистика кеша фрагментов."""
+
+    help = "Выводит долю попаданий в кеш карточек постов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true",
+            help="Обнулить счётчики после вывода.")
+
+    def handle(self, *args, reset, **options):
+        stats = fragment_cache_stats(POST_CARD_PREFIX)
+        self.stdout.write(
+            f"{POST_CARD_PREFIX}: попаданий {stats['hits']}, "
+            f"промахов {stats['misses']}, доля {stats['ratio']:.1%}")
+        if reset:
+            reset_fragment_cache_stats(POST_CARD_PREFIX)
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.constant import SCHEDULER_INTERVAL
+from blog.scheduling import publish_due
+
+
+class Command(BaseCommand):
+    """Публикация отложенных постов по расписанию."""
+
+    help = (
+        "Отмечает видимыми посты, время публикации которых наступило, "
+        "и сбрасывает кеш их лент."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch", action="store_true",
+            help="Не завершаться, а проверять расписание постоянно.")
+        parser.add_argument(
+            "--interval", type=int, default=SCHEDULER_INTERVAL,
+            help="Пауза между проверками в секундах.")
+
+    def handle(self, *args, watch, interval, **options):
+        while True:
+            published = publish_due()
+            if published:
+                self.stdout.write(f"Опубликовано постов: {published}")
+            if not watch:
+                break
+            time.sleep(interval)
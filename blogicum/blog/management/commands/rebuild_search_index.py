@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from blog.search import create_index
+
+
+class Command(BaseCommand):
+    """Перестроение полнотекстового индекса постов."""
+
+    help = (
+        "Пересоздаёт триггеры FTS5 и заново индексирует заголовки "
+        "и тексты всех публикаций."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_index(connection)
+        self.stdout.write("Поисковый индекс перестроен.")
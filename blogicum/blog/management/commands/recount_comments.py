@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.constant import RECOUNT_BATCH_SIZE
+from blog.models import Comments, Post
+
+
+class Command(BaseCommand):
+    """Пересчёт счётчика комментариев у всех публикаций."""
+
+    help = "Пересчитывает Post.comment_count пачками по первичному ключу."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=RECOUNT_BATCH_SIZE,
+            help="Количество публикаций в одной транзакции.")
+
+    def handle(self, *args, batch_size, **options):
+        totals = Comments.objects.filter(
+            post=OuterRef("pk")
+        ).order_by().values("post").annotate(
+            total=Count("pk")).values("total")
+        last_id = 0
+        updated = 0
+        while True:
+            ids = list(
+                Post.objects.filter(pk__gt=last_id).order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                updated += Post.objects.filter(
+                    pk__gte=ids[0], pk__lte=ids[-1]
+                ).update(comment_count=Coalesce(Subquery(totals), 0))
+            last_id = ids[-1]
+        self.stdout.write(f"Пересчитано публикаций: {updated}")
@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+from django.utils.cache import patch_cache_control
+
+from .constant import (
+    PUBLIC_CACHE_MAX_AGE,
+    PUBLIC_CACHE_STALE,
+    PUBLIC_CACHE_VIEWS,
+)
+
+
+class PublicCacheMiddleware:
+    """Заголовки для общих кешей перед сайтом.
+
+    Анонимный GET страниц из PUBLIC_CACHE_VIEWS, на который ответ ушёл
+    без cookies, помечается как public с max-age и
+    stale-while-revalidate. Ответы вошедшим пользователям помечаются
+    как private. Vary: Cookie остаётся: по нему прокси отдаёт общую
+    копию только запросам без cookies.
+
+    Стоит в списке раньше SessionMiddleware и CsrfViewMiddleware, чтобы
+    видеть cookies, которые они добавили к ответу.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        if (request.method not in ("GET", "HEAD") or match is None
+                or match.view_name not in PUBLIC_CACHE_VIEWS):
+            return response
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            patch_cache_control(response, private=True)
+        elif (response.status_code in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED)
+                and not response.cookies):
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=PUBLIC_CACHE_MAX_AGE,
+                stale_while_revalidate=PUBLIC_CACHE_STALE,
+            )
+        return response
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+from blog.utils import make_excerpt
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+    for post in Post.objects.only('pk', 'text').iterator(chunk_size=1000):
+        post.excerpt = make_excerpt(post.text)
+        batch.append(post)
+        if len(batch) == 1000:
+            Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=256, verbose_name='Отрывок'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
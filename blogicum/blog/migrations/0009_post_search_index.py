@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:59
+
+import blog.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+from blog.search import create_index, drop_index
+
+
+def create_search_index(apps, schema_editor):
+    create_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='blog.post')),
+                ('title', models.TextField()),
+                ('text', models.TextField()),
+                ('document', blog.models.SearchField(db_column='blog_post_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'blog_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
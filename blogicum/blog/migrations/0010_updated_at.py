@@ -0,0 +1,47 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+from blog.search import install_triggers
+
+
+def fill_updated_at(apps, schema_editor):
+    for name in ('Category', 'Location', 'Post'):
+        apps.get_model('blog', name).objects.update(
+            updated_at=models.F('created_at'))
+
+
+def restore_search_triggers(apps, schema_editor):
+    install_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_search_index'),
+    ]
+
+    # Пересборка blog_post в SQLite удаляет триггеры поискового индекса,
+    # поэтому они ставятся заново в обе стороны миграции.
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop),
+    ]
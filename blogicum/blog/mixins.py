@@ -1,4 +1,35 @@
+import hashlib
+from calendar import timegm
+from datetime import datetime
+from functools import partial
+from http import HTTPStatus
+
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.safestring import mark_safe
+
+from .cache import (
+    CachedPage,
+    discard_versioned,
+    get_cached_page,
+    get_current_versions,
+    get_tag_versions,
+    page_cache_key,
+    post_card_tags,
+    set_cached_page,
+    unlock_versioned,
+)
+from .constant import (
+    COUNT_APPROXIMATE_LIMIT,
+    COUNT_POSTS_ON_FRAME,
+)
+from .personal import PERSONAL_HOLES, SHARED_BODY, extract_body, fill_holes
+from .scheduling import publish_if_due
+from .utils import CursorPaginator, PostPaginator
 
 
 class CommentSuccessMixin:
@@ -18,3 +49,314 @@ class ProfileSuccessMixin:
         return reverse(
             "blog:profile", kwargs={"username": self.request.user.username}
         )
+
+
+class OwnerObjectMixin:
+    """Миксин загрузки объекта автора одним запросом.
+
+    Объект читается один раз в dispatch, проверяется его автор, и тот же
+    экземпляр отдаётся обобщённому представлению.
+    """
+
+    owner_select_related = ()
+
+    def get_queryset(self):
+        """Выборка объекта вместе с нужными связями."""
+        return super().get_queryset().select_related(
+            *self.owner_select_related)
+
+    def get_object(self, queryset=None):
+        """Объект, загруженный при первом обращении."""
+        if not hasattr(self, "_owned_object"):
+            self._owned_object = super().get_object(queryset)
+        return self._owned_object
+
+    def dispatch(self, request, *args, **kwargs):
+        """Перенаправление на пост, если объект принадлежит не автору."""
+        if self.get_object().author_id != request.user.pk:
+            return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ScheduledFeedMixin:
+    """Миксин ленты, в которой бывают отложенные публикации.
+
+    До чтения кешей запрос публикует посты, время которых наступило,
+    если этого ещё не сделал планировщик publish_scheduled.
+    """
+
+    def setup(self, request, *args, **kwargs):
+        """Публикация наступивших постов до обработки запроса."""
+        super().setup(request, *args, **kwargs)
+        publish_if_due()
+
+
+class CursorPaginationMixin(ScheduledFeedMixin):
+    """Миксин пагинации списка постов по номеру страницы или курсору."""
+
+    paginate_by = COUNT_POSTS_ON_FRAME
+    paginator_class = PostPaginator
+    cursor_kwarg = "cursor"
+    count_approximate_limit = COUNT_APPROXIMATE_LIMIT
+
+    def get_feed_scope(self):
+        """Ключ кеша списка id ленты и теги, от которых он зависит."""
+        return None, ()
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Пагинатор с кешем списка id постов ленты."""
+        feed_scope, feed_tags = self.get_feed_scope()
+        return super().get_paginator(
+            queryset,
+            per_page,
+            feed_scope=feed_scope,
+            feed_tags=feed_tags,
+            approximate_limit=self.count_approximate_limit,
+            **kwargs,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Страница по курсору, если он передан в запросе."""
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if cursor is None:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(cursor)
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PageCacheMixin(ScheduledFeedMixin):
+    """Миксин кеширования страницы, общей для всех посетителей.
+
+    В кеше лежит общая копия страницы, где на месте персональных
+    фрагментов (шапка, кнопки автора, форма комментария) стоят метки;
+    при каждом ответе метки заменяются фрагментами для пользователя
+    запроса. Анонимному посетителю копия отдаётся целиком. Для вошедшего
+    пользователя представление выполняется — проверки доступа и контекст
+    шаблона остаются, — но тело страницы берётся из копии, а посты
+    и комментарии в контексте ленивые и из базы не читаются. Заново
+    отрисовываются только персональные фрагменты, видимые пользователю.
+
+    Страница хранится вместе с версиями тегов, от которых она зависит;
+    сигналы моделей повышают версии, и устаревают только затронутые
+    страницы; наступившая отложенная публикация тоже повышает их.
+    Устаревшую страницу отрисовывает один запрос,
+    остальные тем временем получают прежнюю копию. Если страница при этом
+    пропала или перестала быть общей, копия удаляется из кеша.
+    """
+
+    cache_key_params = ()
+
+    def get_page_cache_key(self):
+        """Ключ кеша страницы: путь и GET-параметры из cache_key_params."""
+        return page_cache_key(self.request, self.cache_key_params)
+
+    def get_cache_scope_tags(self):
+        """Теги, известные по адресу страницы ещё до её отрисовки."""
+        return set()
+
+    def get_cache_object_tags(self, context):
+        """Теги объектов, попавших на отрисованную страницу."""
+        tags = set()
+        page = context.get("page_obj")
+        for post in getattr(page, "cards", page) or ():
+            tags |= post_card_tags(post)
+        return tags
+
+    def is_page_shared(self, context):
+        """Одинакова ли страница без персональных фрагментов для всех."""
+        return True
+
+    def get_page_validators(self, versions):
+        """Валидаторы, которые хранятся вместе со страницей."""
+        return None
+
+    def restore_page_validators(self, validators):
+        """Валидаторы страницы, взятой из кеша."""
+
+    def get_context_data(self, **kwargs):
+        """Контекст с метками вместо персональных фрагментов.
+
+        Если общая копия страницы уже есть в кеше, её тело с фрагментами
+        пользователя попадает в контекст и не отрисовывается заново.
+        """
+        context = super().get_context_data(**kwargs)
+        context[PERSONAL_HOLES] = True
+        page = getattr(self, "cached_page", None)
+        if page is not None and self.is_page_shared(context):
+            body = extract_body(page.content)
+            if body is not None:
+                context[SHARED_BODY] = mark_safe(
+                    fill_holes(body, self.request).decode())
+                self.restore_page_validators(page.validators)
+        return context
+
+    def dispatch(self, request, *args, **kwargs):
+        """Ответ из кеша или отрисовка с сохранением в кеш."""
+        if request.method != "GET":
+            return super().dispatch(request, *args, **kwargs)
+        key = self.get_page_cache_key()
+        page = get_cached_page(key)
+        if page is not None and not request.user.is_authenticated:
+            self.restore_page_validators(page.validators)
+            return HttpResponse(
+                fill_holes(page.content, request),
+                content_type=page.content_type)
+        self.cached_page = page
+        versions = get_tag_versions(self.get_cache_scope_tags())
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except Http404:
+            discard_versioned(key)
+            raise
+        except BaseException:
+            unlock_versioned(key)
+            raise
+        if hasattr(response, "add_post_render_callback"):
+            response.add_post_render_callback(
+                partial(self._store_page, key, versions))
+        else:
+            discard_versioned(key)
+        return response
+
+    def _store_page(self, key, versions, response):
+        if SHARED_BODY not in response.context_data:
+            self._save_page(key, versions, response)
+        response.content = fill_holes(response.content, self.request)
+
+    def _save_page(self, key, versions, response):
+        # Страница, которая не отрисовалась или перестала быть общей,
+        # удаляется из кеша, чтобы прежнюю копию больше никто не получил.
+        context = response.context_data
+        if (response.status_code != HTTPStatus.OK
+                or not self.is_page_shared(context)):
+            discard_versioned(key)
+        elif response.cookies:
+            unlock_versioned(key)
+        else:
+            tags = self.get_cache_object_tags(context)
+            versions.update(get_tag_versions(tags - versions.keys()))
+            set_cached_page(
+                key,
+                CachedPage(
+                    response.content,
+                    response["Content-Type"],
+                    self.get_page_validators(versions),
+                ),
+                versions,
+            )
+
+
+def _versions_stamp(versions):
+    """Отпечаток страницы по версиям тегов её записи в кеше."""
+    return {"tags": tuple(sorted(versions.items()))}
+
+
+def _stamp_validators(stamp):
+    """Отпечаток содержимого и время изменения по словарю значений."""
+    if stamp is None:
+        return None
+    digest = hashlib.md5(repr(sorted(stamp.items())).encode()).hexdigest()
+    dates = [value for value in stamp.values() if isinstance(value, datetime)]
+    return digest, timegm(max(dates).utctimetuple()) if dates else None
+
+
+class ConditionalGetMixin:
+    """Миксин условных GET-запросов по ETag и Last-Modified.
+
+    Валидаторы считаются до выборки и отрисовки страницы; если они
+    совпадают с заголовками запроса, отдаётся 304 и шаблон
+    не отрисовывается. У страниц со списками ETag берётся из версий
+    тегов их записи в кеше: версии только растут, даже когда пост
+    удаляют или снимают с публикации, и проверка обходится без базы.
+    Last-Modified у таких страниц нет — по датам постов он бы сдвигался
+    назад. В ETag входит пользователь: вошедшие пользователи видят
+    на странице свои ссылки и формы.
+    """
+
+    def get_versions_cache_key(self):
+        """Ключ записи кеша, по версиям тегов которой считается ETag."""
+        return self.get_page_cache_key()
+
+    def get_change_stamp(self):
+        """Словарь значений, от которых зависит страница, или None."""
+        key = self.get_versions_cache_key()
+        versions = None if key is None else get_current_versions(key)
+        return None if versions is None else _versions_stamp(versions)
+
+    def get_change_validators(self):
+        """Отпечаток содержимого и время изменения, один раз за запрос."""
+        if not hasattr(self, "_change_validators"):
+            self._change_validators = _stamp_validators(
+                self.get_change_stamp())
+        return self._change_validators
+
+    def get_page_validators(self, versions):
+        """Отпечаток и время изменения для страницы в кеше.
+
+        Если ETag считается по версиям тегов, берутся версии, с которыми
+        страница сохраняется.
+        """
+        if self.get_versions_cache_key() is not None:
+            self._change_validators = _stamp_validators(
+                _versions_stamp(versions))
+        return self.get_change_validators()
+
+    def restore_page_validators(self, validators):
+        """Отпечаток страницы из кеша вместо агрегирующего запроса."""
+        if validators is not None:
+            self._change_validators = validators
+
+    def get_validators(self):
+        """Пара ETag для пользователя запроса и Last-Modified."""
+        validators = self.get_change_validators()
+        if validators is None:
+            return None, None
+        digest, last_modified = validators
+        user = self.request.user
+        etag = hashlib.md5(
+            repr((digest, user.pk, user.get_username())).encode()
+        ).hexdigest()
+        return quote_etag(etag), last_modified
+
+    def set_validators(self, response):
+        """Заголовки ETag и Last-Modified ответа."""
+        etag, last_modified = self.get_validators()
+        if etag is not None and not response.has_header("ETag"):
+            response["ETag"] = etag
+        if last_modified is not None and not response.has_header(
+                "Last-Modified"):
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        """Ответ 304, если у клиента актуальная версия страницы."""
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        if ("HTTP_IF_NONE_MATCH" in request.META
+                or "HTTP_IF_MODIFIED_SINCE" in request.META):
+            etag, last_modified = self.get_validators()
+            if etag is not None:
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=last_modified)
+                if response is not None:
+                    return self.set_validators(response)
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, "add_post_render_callback"):
+            response.add_post_render_callback(self._set_ok_validators)
+        else:
+            self._set_ok_validators(response)
+        return response
+
+    def _set_ok_validators(self, response):
+        # После отрисовки: страница в кеше могла получить свои валидаторы.
+        if response.status_code == HTTPStatus.OK:
+            self.set_validators(response)
+
+    def get(self, request, *args, **kwargs):
+        """Страница по данным не старше посчитанных валидаторов."""
+        self.get_change_validators()
+        return super().get(request, *args, **kwargs)
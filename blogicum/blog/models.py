@@ -1,10 +1,15 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
-from .constant import MAX_LENGHT_TEXT, MAX_LENGHT_COMMENT
+from .constant import MAX_LENGHT_TEXT, MAX_LENGHT_COMMENT, MAX_LENGHT_EXCERPT
+from .links import build_url
+from .utils import PostQuerySet, make_excerpt
 
 User = get_user_model()
 
+VISIBILITY_FIELDS = {'is_published', 'category', 'category_id', 'pub_date'}
+
 
 class BaseMainModel(models.Model):
     """Базовый класс."""
@@ -13,6 +18,7 @@ class BaseMainModel(models.Model):
         'Опубликовано',
         default=True, help_text='Снимите галочку, чтобы скрыть публикацию.')
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
 
     class Meta:
         """Класс Meta."""
@@ -39,6 +45,10 @@ class Category(BaseMainModel):
         """Метод переопределения вывода."""
         return self.title
 
+    def get_absolute_url(self):
+        """Адрес ленты категории."""
+        return build_url('blog:category_posts', self.slug)
+
 
 class Location(BaseMainModel):
     """Класс Локаций."""
@@ -61,6 +71,8 @@ class Post(BaseMainModel):
 
     title = models.CharField('Название', max_length=MAX_LENGHT_TEXT)
     text = models.TextField('Текст')
+    excerpt = models.CharField(
+        'Отрывок', max_length=MAX_LENGHT_EXCERPT, blank=True, editable=False)
     pub_date = models.DateTimeField('Дата и время публикации',
                                     help_text='Если установить дату и время в\
  будущем — можно делать отложенные публикации.')
@@ -73,12 +85,72 @@ class Post(BaseMainModel):
         Category, on_delete=models.SET_NULL, null=True,
         verbose_name='Категория')
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False)
+    is_visible = models.BooleanField(
+        'Виден в лентах', default=False, editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         """Класс Meta."""
 
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_published_feed_idx'),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx'),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_published=True, is_visible=False),
+                name='post_scheduled_idx'),
+        )
+
+    def get_absolute_url(self):
+        """Адрес страницы поста."""
+        return build_url('blog:post_detail', self.pk)
+
+    def compute_visibility(self):
+        """Виден ли пост всем посетителям по текущим значениям полей.
+
+        Время сравнивается с точным текущим, поэтому пост, сохранённый
+        формой с текущим временем, виден сразу.
+        """
+        pub_date = self.pub_date
+        if pub_date is not None and timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+        return bool(
+            self.is_published
+            and self.category_id
+            and self.category.is_published
+            and pub_date is not None
+            and pub_date < timezone.now()
+        )
+
+    def save(self, *args, **kwargs):
+        """Сохранение с пересчётом отрывка текста и видимости."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = kwargs['update_fields'] = set(update_fields)
+        if 'text' not in self.get_deferred_fields():
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None and 'text' in update_fields:
+                update_fields.add('excerpt')
+        self.is_visible = self.compute_visibility()
+        if update_fields is not None:
+            update_fields.add('updated_at')
+            if update_fields & VISIBILITY_FIELDS:
+                update_fields.add('is_visible')
+        super().save(*args, **kwargs)
 
 
 class Comments(models.Model):
@@ -94,7 +166,59 @@ class Comments(models.Model):
         """Класс Meta."""
 
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comments_post_created_idx'),
+        )
 
     def __str__(self) -> str:
         """Метод переопределения вывода."""
         return self.text[:MAX_LENGHT_COMMENT]
+
+    def get_absolute_url(self):
+        """Адрес комментария на странице поста."""
+        return (
+            f"{build_url('blog:post_detail', self.post_id)}"
+            f"#comment_{self.pk}")
+
+
+class FullTextMatch(models.Lookup):
+    """Условие полнотекстового поиска SQLite FTS5: column MATCH query."""
+
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        """SQL условия MATCH."""
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class SearchField(models.TextField):
+    """Скрытый столбец FTS5 с именем таблицы, по которому ищут MATCH."""
+
+
+SearchField.register_lookup(FullTextMatch)
+
+
+class PostSearchIndex(models.Model):
+    """Полнотекстовый индекс FTS5 по заголовку и тексту постов.
+
+    Таблица создаётся миграцией и наполняется триггерами на blog_post,
+    поэтому Django ею не управляет.
+    """
+
+    post = models.OneToOneField(
+        Post, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='rowid', related_name='search_index')
+    title = models.TextField()
+    text = models.TextField()
+    document = SearchField(db_column='blog_post_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        """Класс Meta."""
+
+        managed = False
+        db_table = 'blog_post_fts'
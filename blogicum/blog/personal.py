@@ -0,0 +1,107 @@
+import base64
+import json
+import re
+from typing import NamedTuple, Optional
+
+from django.template.loader import render_to_string
+
+from .forms import CommentForm
+
+# Переменная контекста: вместо персональных фрагментов выводить метки.
+PERSONAL_HOLES = "personal_holes"
+
+# Переменная контекста: готовое тело страницы из общей копии в кеше.
+SHARED_BODY = "shared_body"
+
+HOLE_PATTERN = re.compile(rb"<!--personal:([A-Za-z0-9_=-]+)-->")
+
+BODY_START = b"<!--shared-body-->"
+BODY_END = b"<!--/shared-body-->"
+
+
+class Fragment(NamedTuple):
+    """Персональный фрагмент: шаблон и кому он показывается.
+
+    users_only — фрагмент виден только вошедшим пользователям; owner —
+    параметр метки с id единственного пользователя, которому он виден.
+    Остальным фрагмент не отрисовывается вовсе.
+    """
+
+    template: str
+    users_only: bool = False
+    owner: Optional[str] = None
+
+
+FRAGMENTS = {
+    "header": Fragment("includes/header.html"),
+    "post_controls": Fragment(
+        "includes/post_controls.html", users_only=True, owner="author_id"),
+    "comment_controls": Fragment(
+        "includes/comment_controls.html", users_only=True, owner="author_id"),
+    "comment_form": Fragment(
+        "includes/comment_form_block.html", users_only=True),
+    "profile_controls": Fragment(
+        "includes/profile_controls.html", users_only=True, owner="profile_id"),
+}
+
+
+def fragment_context(name, params):
+    """Контекст фрагмента из параметров метки."""
+    context = dict(params)
+    if name == "comment_form":
+        context["form"] = CommentForm()
+    return context
+
+
+def is_shown(fragment, request, params):
+    """Виден ли фрагмент пользователю запроса."""
+    if not fragment.users_only:
+        return True
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return False
+    return fragment.owner is None or params.get(fragment.owner) == user.pk
+
+
+def render_fragment(name, request, params):
+    """HTML персонального фрагмента для пользователя запроса.
+
+    Фрагмент, который пользователю не виден, не отрисовывается: так
+    анонимному посетителю отрисовывается только шапка, а вошедшему —
+    кнопки лишь у его собственных комментариев.
+    """
+    fragment = FRAGMENTS[name]
+    if not is_shown(fragment, request, params):
+        return ""
+    return render_to_string(
+        fragment.template, fragment_context(name, params), request=request)
+
+
+def hole(name, params):
+    """Метка на месте фрагмента в общей для всех копии страницы.
+
+    Параметры — простые значения вроде id, поэтому метку можно
+    сохранить в кеше и развернуть для любого пользователя.
+    """
+    payload = json.dumps([name, params], separators=(",", ":"))
+    token = base64.urlsafe_b64encode(payload.encode()).decode()
+    return f"<!--personal:{token}-->"
+
+
+def fill_holes(content, request):
+    """Страница с фрагментами для пользователя запроса на месте меток."""
+    def fill(match):
+        name, params = json.loads(base64.urlsafe_b64decode(match[1]))
+        return render_fragment(name, request, params).encode()
+
+    content = content.replace(BODY_START, b"").replace(BODY_END, b"")
+    return HOLE_PATTERN.sub(fill, content)
+
+
+def extract_body(content):
+    """Тело страницы между метками или None, если меток нет."""
+    start = content.find(BODY_START)
+    end = content.find(BODY_END, start)
+    if start == -1 or end == -1:
+        return None
+    return content[start + len(BODY_START):end]
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.utils import timezone
+
+from .cache import invalidate_tags, post_feed_tags
+from .constant import CACHE_LOCK_TIMEOUT, SCHEDULER_INTERVAL
+from .models import Post
+
+NEXT_PUBLICATION_KEY = "schedule:next"
+
+PUBLISH_LOCK_KEY = "lock:schedule:publish"
+
+
+def next_publication():
+    """Время публикации ближайшего ещё не видимого поста или None.
+
+    Значение живёт в кеше не дольше SCHEDULER_INTERVAL, поэтому
+    отложенные посты, сохранённые в другом процессе, замечаются
+    не позже чем через этот срок.
+    """
+    entry = cache.get(NEXT_PUBLICATION_KEY)
+    if entry is None:
+        entry = (Post.objects.next_scheduled(),)
+        cache.set(NEXT_PUBLICATION_KEY, entry, SCHEDULER_INTERVAL)
+    return entry[0]
+
+
+def reset_next_publication():
+    """Сброс сохранённого времени ближайшей публикации."""
+    cache.delete(NEXT_PUBLICATION_KEY)
+
+
+def publish_due():
+    """Отметка видимыми постов, время публикации которых наступило.
+
+    Сбрасывает кеш их лент и возвращает число опубликованных постов.
+    """
+    posts = list(
+        Post.objects.due().select_related("author", "category")
+        .only("pk", "author__username", "category__slug")
+    )
+    published = 0
+    if posts:
+        published = Post.objects.due().filter(
+            pk__in=[post.pk for post in posts]
+        ).update(is_visible=True, updated_at=timezone.now())
+        invalidate_tags(*set().union(*map(post_feed_tags, posts)))
+    reset_next_publication()
+    return published
+
+
+def publish_if_due():
+    """Публикация наступивших постов прямо в запросе.
+
+    Обычно это одно чтение из кеша. Когда время ближайшей публикации
+    прошло, посты публикует один запрос, взявший блокировку, остальные
+    его не ждут.
+    """
+    next_date = next_publication()
+    if next_date is None or next_date >= timezone.now():
+        return 0
+    if not cache.add(PUBLISH_LOCK_KEY, True, CACHE_LOCK_TIMEOUT):
+        return 0
+    try:
+        return publish_due()
+    finally:
+        cache.delete(PUBLISH_LOCK_KEY)
@@ -0,0 +1,90 @@
+import re
+
+SEARCH_TABLE = "blog_post_fts"
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "title, text, content='blog_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+# Таблица внешнего содержимого: триггеры переносят в индекс каждое
+# изменение blog_post, в том числе сделанное через QuerySet.update().
+TRIGGERS_SQL = {
+    "blog_post_fts_insert": (
+        "AFTER INSERT ON blog_post BEGIN "
+        f"INSERT INTO {SEARCH_TABLE}(rowid, title, text) "
+        "VALUES (new.id, new.title, new.text); END"
+    ),
+    "blog_post_fts_delete": (
+        "AFTER DELETE ON blog_post BEGIN "
+        f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, text) "
+        "VALUES ('delete', old.id, old.title, old.text); END"
+    ),
+    "blog_post_fts_update": (
+        "AFTER UPDATE OF title, text ON blog_post BEGIN "
+        f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, text) "
+        "VALUES ('delete', old.id, old.title, old.text); "
+        f"INSERT INTO {SEARCH_TABLE}(rowid, title, text) "
+        "VALUES (new.id, new.title, new.text); END"
+    ),
+}
+
+
+def install_triggers(connection):
+    """Пересоздание триггеров индекса.
+
+    SQLite теряет триггеры, когда миграция пересобирает blog_post,
+    поэтому такие миграции вызывают эту функцию снова.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, body in TRIGGERS_SQL.items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def rebuild_index(connection):
+    """Полное перестроение индекса по содержимому blog_post."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+
+
+def create_index(connection):
+    """Создание индекса, его триггеров и наполнение."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_TABLE_SQL)
+    install_triggers(connection)
+    rebuild_index(connection)
+
+
+def drop_index(connection):
+    """Удаление индекса вместе с триггерами."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name in TRIGGERS_SQL:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def match_query(text):
+    """Запрос FTS5 из пользовательского ввода.
+
+    Каждое слово берётся в кавычки, чтобы операторы FTS5 в вводе
+    не ломали запрос; последнее слово ищется как префикс.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
@@ -0,0 +1,201 @@
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.db.models.functions import Greatest
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import autocomplete
+from .cache import (
+    FEED_TAG,
+    author_feed_tag,
+    category_feed_tag,
+    category_tag,
+    invalidate_tags,
+    location_tag,
+    post_feed_tags,
+    post_tag,
+    user_tag,
+)
+from .models import Category, Comments, Location, Post, User
+from .scheduling import reset_next_publication
+from .utils import make_excerpt, visibility_filter
+
+
+@receiver(post_save, sender=Comments)
+def increase_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Увеличение счётчика комментариев поста при новом комментарии.
+
+    Время изменения поста сдвигается и при правке комментария:
+    по нему считаются валидаторы страницы поста.
+    """
+    if raw:
+        return
+    changes = {"updated_at": timezone.now()}
+    if created:
+        changes["comment_count"] = F("comment_count") + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comments)
+def decrease_comment_count(sender, instance, **kwargs):
+    """Уменьшение счётчика комментариев поста при удалении комментария.
+
+    Срабатывает и при каскадном удалении, например вместе с автором.
+    """
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+@receiver(pre_save, sender=Post)
+def fill_raw_updated_at(sender, instance, raw=False, **kwargs):
+    """Время изменения объектов из фикстуры, где его нет.
+
+    При загрузке фикстуры auto_now не срабатывает, а в старых
+    фикстурах поля updated_at ещё нет.
+    """
+    if raw and instance.updated_at is None:
+        instance.updated_at = instance.created_at
+
+
+@receiver(pre_save, sender=Post)
+def fill_raw_excerpt(sender, instance, raw=False, **kwargs):
+    """Отрывок текста постов из фикстуры: Post.save() для них не вызывается."""
+    if raw and not instance.excerpt:
+        instance.excerpt = make_excerpt(instance.text)
+
+
+@receiver(post_init, sender=Post)
+def remember_post_feeds(sender, instance, **kwargs):
+    """Категория и автор поста на момент загрузки из базы."""
+    instance._loaded_feeds = (
+        instance.__dict__.get("category_id"),
+        instance.__dict__.get("author_id"),
+    )
+
+
+@receiver(pre_save, sender=Post)
+def invalidate_previous_post_feeds(sender, instance, raw=False, **kwargs):
+    """Сброс лент, из которых пост уходит после изменения."""
+    category_id, author_id = instance._loaded_feeds
+    tags = set()
+    if category_id and category_id != instance.category_id:
+        tags.add(category_tag(category_id))
+    if author_id and author_id != instance.author_id:
+        tags.add(user_tag(author_id))
+    invalidate_tags(*tags)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, **kwargs):
+    """Сброс страниц поста и лент, в которые он входит."""
+    if kwargs.get("raw"):
+        return
+    invalidate_tags(*post_feed_tags(instance))
+    instance._loaded_feeds = (instance.category_id, instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_post_schedule(sender, **kwargs):
+    """Сброс времени ближайшей публикации: расписание могло измениться."""
+    if kwargs.get("raw"):
+        return
+    reset_next_publication()
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def invalidate_comment_post(sender, instance, **kwargs):
+    """Сброс страниц, где виден пост комментария и число комментариев."""
+    invalidate_tags(post_tag(instance.post_id))
+
+
+@receiver(post_save, sender=Category)
+def update_category_posts_visibility(sender, instance, raw=False, **kwargs):
+    """Пересчёт видимости постов категории после её изменения."""
+    if raw:
+        return
+    posts = Post.objects.filter(category=instance)
+    now = timezone.now()
+    posts.filter(is_visible=True).exclude(visibility_filter()).update(
+        is_visible=False, updated_at=now)
+    posts.due().update(is_visible=True, updated_at=now)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    """Скрытие постов, которые остаются без категории."""
+    Post.objects.filter(category=instance).update(
+        is_visible=False, updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Location)
+def touch_location_posts(sender, instance, **kwargs):
+    """Отметка изменения постов, которые теряют местоположение."""
+    Post.objects.filter(location=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    """Сброс страниц категории и общей ленты."""
+    invalidate_tags(
+        category_tag(instance.pk), category_feed_tag(instance.slug), FEED_TAG)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location(sender, instance, **kwargs):
+    """Сброс страниц с постами из этого местоположения."""
+    invalidate_tags(location_tag(instance.pk))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, update_fields=None, **kwargs):
+    """Сброс профиля пользователя и страниц с его именем."""
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    invalidate_tags(
+        user_tag(instance.pk), author_feed_tag(instance.username))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def update_post_autocomplete(sender, instance, **kwargs):
+    """Заголовок поста в индексе подсказок."""
+    if kwargs.get("raw"):
+        return
+    autocomplete.update_post(instance, deleted="created" not in kwargs)
+
+
+@receiver(post_save, sender=Category)
+def update_category_autocomplete(sender, instance, raw=False, **kwargs):
+    """Категория и её посты в индексе подсказок."""
+    if not raw:
+        autocomplete.update_category(instance)
+
+
+@receiver(pre_delete, sender=Category)
+def remove_category_autocomplete(sender, instance, **kwargs):
+    """Удаление категории и её постов из индекса подсказок."""
+    autocomplete.update_category(instance, deleted=True)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def update_user_autocomplete(sender, instance, **kwargs):
+    """Имя пользователя в индексе подсказок."""
+    autocomplete.update_user(instance, deleted="created" not in kwargs)
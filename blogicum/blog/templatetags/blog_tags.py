@@ -0,0 +1,75 @@
+from django import template
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog.cache import get_post_card
+from blog.cards import as_card
+from blog.links import build_url
+from blog.personal import (
+    BODY_END,
+    BODY_START,
+    PERSONAL_HOLES,
+    SHARED_BODY,
+    hole,
+    render_fragment,
+)
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    """Карточка поста или PostCard из кеша фрагментов."""
+    return mark_safe(get_post_card(
+        post,
+        lambda: render_to_string(
+            "includes/post_card.html", {"post": as_card(post)}),
+    ))
+
+
+@register.simple_tag
+def url_path(viewname, *args):
+    """Адрес страницы, как {% url %}, без обхода резолвера."""
+    return build_url(viewname, *args)
+
+
+@register.simple_tag(takes_context=True)
+def personal(context, name, **params):
+    """Фрагмент, зависящий от пользователя.
+
+    В странице, которая кешируется для всех, на его месте остаётся
+    метка; её заменяет фрагмент для пользователя каждого запроса.
+    """
+    if context.get(PERSONAL_HOLES):
+        return mark_safe(hole(name, params))
+    return mark_safe(render_fragment(
+        name, getattr(context, "request", None), params))
+
+
+class SharedBodyNode(template.Node):
+    """Тело страницы: из общей копии в кеше или отрисованное заново."""
+
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        body = context.get(SHARED_BODY)
+        if body is not None:
+            return body
+        body = self.nodelist.render(context)
+        if context.get(PERSONAL_HOLES):
+            return mark_safe(
+                f"{BODY_START.decode()}{body}{BODY_END.decode()}")
+        return body
+
+
+@register.tag
+def shared_body(parser, token):
+    """Часть страницы, общая для всех пользователей.
+
+    Вошедшему пользователю она берётся из кешированной копии страницы,
+    а вокруг отрисовываются только персональные части.
+    """
+    nodelist = parser.parse(("endshared_body",))
+    parser.delete_first_token()
+    return SharedBodyNode(nodelist)
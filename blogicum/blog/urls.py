@@ -1,6 +1,6 @@
 from django.urls import path, include
 
-from . import views
+from . import feeds, views
 
 
 app_name = 'blog'
@@ -9,10 +9,25 @@ app_name = 'blog'
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
     path('auth/', include('django.contrib.auth.urls')),
+    path('feed/',
+         views.PostFeedView.as_view(feed_class=feeds.PostFeed),
+         name='feed'),
+    path('feed/atom/',
+         views.PostFeedView.as_view(feed_class=feeds.PostAtomFeed),
+         name='feed_atom'),
     path('profile/<str:username>/',
          views.ProfileListView.as_view(), name='profile'),
+    path('profile/<str:username>/feed/',
+         views.PostFeedView.as_view(feed_class=feeds.AuthorPostFeed),
+         name='author_feed'),
+    path('profile/<str:username>/feed/atom/',
+         views.PostFeedView.as_view(feed_class=feeds.AuthorPostAtomFeed),
+         name='author_feed_atom'),
     path('profile/edit_profile',
          views.ProfileUpdateView.as_view(), name='edit_profile'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('autocomplete/',
+         views.AutocompleteView.as_view(), name='autocomplete'),
     path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
     path('posts/<int:post_id>/edit/',
          views.PostUpdateView.as_view(), name='edit_post'),
@@ -22,6 +37,14 @@ urlpatterns = [
          name='post_detail'),
     path('category/<slug:category_slug>/',
          views.CategoryListView.as_view(), name='category_posts'),
+    path('category/<slug:category_slug>/feed/',
+         views.PostFeedView.as_view(feed_class=feeds.CategoryPostFeed),
+         name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/',
+         views.PostFeedView.as_view(feed_class=feeds.CategoryPostAtomFeed),
+         name='category_feed_atom'),
+    path('posts/<int:post_id>/comments/',
+         views.CommentListView.as_view(), name='comments'),
     path('posts/<int:post_id>/comment/',
          views.AddCommentView.as_view(), name='add_comment'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>/',
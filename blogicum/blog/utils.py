@@ -1,18 +1,387 @@
-from datetime import datetime
-
-from django.core.paginator import Paginator
+import base64
+import binascii
+import json
+from collections.abc import Sequence
 
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
 from django.db import models
-from django.db.models import Count
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject, cached_property
+from django.utils.text import Truncator
+
+from .cache import (
+    feed_ids_cache_key,
+    get_tag_versions,
+    get_versioned,
+    set_versioned,
+    unlock_versioned,
+)
+from .cards import CARD_FIELDS, PostCard, as_card
+from .constant import (
+    EXCERPT_WORDS,
+    FEED_IDS_CACHE_TIMEOUT,
+    MAX_LENGHT_EXCERPT,
+    PAGES_ON_EACH_SIDE,
+    PAGES_ON_ENDS,
+    POST_ORDERING,
+)
+from .search import match_query
+
+CURSOR_NEXT = "n"
+CURSOR_PREVIOUS = "p"
+CURSOR_LAST = "last"
+
+
+def visibility_filter():
+    """Условие, при котором пост должен быть виден всем посетителям.
+
+    Используется для пересчёта Post.is_visible; время сравнивается
+    с точным текущим, как в Post.compute_visibility.
+    """
+    return Q(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lt=timezone.now()
+    )
+
+
+def published_filter():
+    """Условие, при котором пост виден всем посетителям."""
+    return Q(is_visible=True)
+
+
+def make_excerpt(text):
+    """Отрывок текста поста для карточки, как truncatewords."""
+    excerpt = Truncator(text).words(EXCERPT_WORDS, truncate=" …")
+    return Truncator(excerpt).chars(MAX_LENGHT_EXCERPT)
+
+
+class InvalidCursor(InvalidPage):
+    """Курсор страницы повреждён или не подходит к выборке."""
+
+
+class CursorPaginator:
+    """Пагинатор по ключу сортировки (курсору).
+
+    Страница выбирается условием по последней увиденной записи, а не
+    смещением, поэтому стоимость любой страницы одинакова.
+    """
+
+    page_range = ()
+
+    def __init__(self, object_list, per_page, ordering=POST_ORDERING):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(
+            object_list.model._meta.get_field(name.lstrip("-"))
+            for name in self.ordering
+        )
+
+    def encode(self, obj, direction):
+        """Курсор, указывающий на запись obj."""
+        values = [field.value_to_string(obj) for field in self.fields]
+        raw = json.dumps([direction, values])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode(self, cursor):
+        """Направление и значения ключа, записанные в курсоре."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            direction, values = json.loads(raw)
+            if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+                raise ValueError
+            if len(values) != len(self.fields):
+                raise ValueError
+            values = [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (
+            binascii.Error, TypeError, ValueError, ValidationError
+        ) as error:
+            raise InvalidCursor("Некорректный курсор страницы.") from error
+        return direction, values
+
+    def _seek(self, values, reverse):
+        """Условие «строго после values» в порядке сортировки."""
+        names = [name.lstrip("-") for name in self.ordering]
+        descending = [
+            name.startswith("-") != reverse for name in self.ordering
+        ]
+        after = Q()
+        for index, name in enumerate(names):
+            lookup = "lt" if descending[index] else "gt"
+            after |= Q(
+                **dict(zip(names[:index], values[:index])),
+                **{f"{name}__{lookup}": values[index]},
+            )
+        first = "lte" if descending[0] else "gte"
+        return Q(**{f"{names[0]}__{first}": values[0]}) & after
+
+    def page(self, cursor=None):
+        """Страница, на которую указывает курсор."""
+        if not cursor:
+            direction, values = CURSOR_NEXT, None
+        elif cursor == CURSOR_LAST:
+            direction, values = CURSOR_PREVIOUS, None
+        else:
+            direction, values = self.decode(cursor)
+        reverse = direction == CURSOR_PREVIOUS
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                name[1:] if name.startswith("-") else f"-{name}"
+                for name in ordering
+            ]
+        queryset = self.object_list.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse))
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+            return CursorPage(
+                object_list, self,
+                has_next=values is not None, has_previous=has_more)
+        return CursorPage(
+            object_list, self,
+            has_next=has_more, has_previous=values is not None)
+
+
+class CursorPage(Sequence):
+    """Страница пагинатора по курсору."""
+
+    number = None
+    elided_page_range = ()
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<Page cursor of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @cached_property
+    def cards(self):
+        """Карточки постов страницы в её порядке."""
+        return [as_card(post) for post in self.object_list]
+
+    @cached_property
+    def next_cursor(self):
+        """Курсор следующей страницы."""
+        if not self._has_next:
+            return ""
+        return self.paginator.encode(self.object_list[-1], CURSOR_NEXT)
 
-from .constant import COUNT_POSTS_ON_FRAME
+    @cached_property
+    def previous_cursor(self):
+        """Курсор предыдущей страницы."""
+        if not self._has_previous:
+            return ""
+        if not self.object_list:
+            return CURSOR_LAST
+        return self.paginator.encode(self.object_list[0], CURSOR_PREVIOUS)
 
 
-def page_counter(self, model):
-    """Функция подсчета страниц."""
-    paginator = Paginator(model, COUNT_POSTS_ON_FRAME)
-    page_number = self.request.GET.get("page")
-    return paginator.get_page(page_number)
+class PostPaginator(Paginator):
+    """Постраничный пагинатор лент с кешем списка id постов.
+
+    Номера страниц остаются прежними, а ссылки «вперёд» и «назад» ведут
+    в режим курсора, чтобы обход ленты не упирался в глубокий OFFSET.
+    Упорядоченный список id ленты хранится в кеше под ключом feed_scope
+    до изменения feed_tags; устаревший список пересчитывает один
+    запрос, остальные пока читают прежний. Страница берёт свой отрезок
+    списка и загружает посты одним запросом по первичному ключу при первом
+    обращении: тело страницы из кеша их не читает. Список
+    ограничен approximate_limit записями, дальше число записей
+    приблизительное, а страницы за этой границей выбираются через OFFSET.
+    """
+
+    def __init__(
+        self, object_list, per_page, *args, ordering=POST_ORDERING,
+        feed_scope=None, feed_tags=(), approximate_limit=None, **kwargs
+    ):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.ordering = ordering
+        self.feed_scope = feed_scope
+        self.feed_tags = set(feed_tags)
+        self.approximate_limit = approximate_limit
+        self.approximate = False
+
+    @cached_property
+    def feed_ids(self):
+        """Упорядоченные id ленты из кеша; None, если ленту не кешируют."""
+        if self.feed_scope is None:
+            return None
+        key = feed_ids_cache_key(self.feed_scope)
+        ids = get_versioned(key)
+        if ids is not None:
+            return ids
+        versions = get_tag_versions(self.feed_tags)
+        ids = self.object_list.values_list("pk", flat=True)
+        if self.approximate_limit is not None:
+            ids = ids[:self.approximate_limit + 1]
+        try:
+            ids = list(ids)
+        except BaseException:
+            unlock_versioned(key)
+            raise
+        set_versioned(key, ids, versions, FEED_IDS_CACHE_TIMEOUT)
+        return ids
+
+    @cached_property
+    def count(self):
+        """Число записей, по возможности по списку id из кеша."""
+        if self.feed_ids is None:
+            return self._count_rows()
+        return self._bounded(len(self.feed_ids))
+
+    def _count_rows(self):
+        if self.approximate_limit is None:
+            return self.object_list.count()
+        return self._bounded(self.object_list.order_by().values("pk")[
+            :self.approximate_limit + 1].count())
+
+    def _bounded(self, count):
+        if self.approximate_limit is None or count <= self.approximate_limit:
+            return count
+        self.approximate = True
+        return self.approximate_limit
+
+    def validate_number(self, number):
+        """Номер страницы; за приблизительным концом ленты не ограничен."""
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.approximate or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        """Страница ленты; посты отрезка списка id загружаются по ключу."""
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        if bottom >= self.count > 0:
+            return self._page_past_count(number, bottom)
+        if self.feed_ids is None:
+            return super().page(number)
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        ids = self.feed_ids[bottom:top]
+
+        def load():
+            posts = self.object_list.in_bulk(ids)
+            return [posts[pk] for pk in ids if pk in posts]
+
+        page = self._get_page(SimpleLazyObject(load), number, self)
+        page.post_ids = ids
+        return page
+
+    def _page_past_count(self, number, bottom):
+        # За приблизительным концом ленты номеров в списке id нет.
+        posts = list(self.object_list[bottom:bottom + self.per_page])
+        if not posts:
+            raise EmptyPage("Страница за концом ленты.")
+        return self._get_page(posts, number, self)
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3, on_ends=2):
+        """Сокращённый список номеров страниц.
+
+        При приблизительном числе записей последние номера неизвестны,
+        поэтому список заканчивается многоточием.
+        """
+        pages = list(super().get_elided_page_range(
+            number, on_each_side=on_each_side, on_ends=on_ends))
+        if not self.approximate:
+            return pages
+        if len(pages) > on_ends and pages[-on_ends - 1] == self.ELLIPSIS:
+            pages = pages[:-on_ends - 1]
+        return pages + [self.ELLIPSIS]
+
+    def _get_page(self, *args, **kwargs):
+        return PostPage(*args, **kwargs)
+
+
+class PostPage(Page):
+    """Страница постраничного пагинатора с курсорами соседних страниц.
+
+    Шаблоны лент выводят cards — карточки, прочитанные запросом
+    .values(); экземпляры постов в object_list загружаются, только если
+    к ним обращаются.
+    """
+
+    post_ids = None
+
+    def has_next(self):
+        """За приблизительным концом ленты записи всегда есть."""
+        if self.paginator.approximate:
+            return True
+        return super().has_next()
+
+    @cached_property
+    def elided_page_range(self):
+        """Номера страниц для навигации вокруг текущей."""
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=PAGES_ON_EACH_SIDE,
+            on_ends=PAGES_ON_ENDS,
+        )
+
+    @cached_property
+    def _cursors(self):
+        return CursorPaginator(
+            self.paginator.object_list,
+            self.paginator.per_page,
+            self.paginator.ordering,
+        )
+
+    @cached_property
+    def cards(self):
+        """Карточки постов страницы в её порядке."""
+        if self.post_ids is None:
+            return [as_card(post) for post in self]
+        cards = {
+            card.pk: card
+            for card in self.paginator.object_list.filter(
+                pk__in=self.post_ids).order_by().cards()
+        }
+        return [cards[pk] for pk in self.post_ids if pk in cards]
+
+    @cached_property
+    def next_cursor(self):
+        """Курсор следующей страницы."""
+        if not self.has_next() or not self.cards:
+            return ""
+        return self._cursors.encode(self.cards[-1], CURSOR_NEXT)
+
+    @cached_property
+    def previous_cursor(self):
+        """Курсор предыдущей страницы."""
+        if not self.has_previous() or not self.cards:
+            return ""
+        return self._cursors.encode(self.cards[0], CURSOR_PREVIOUS)
 
 
 class PostQuerySet(models.QuerySet):
@@ -36,14 +405,55 @@ class PostQuerySet(models.QuerySet):
 
         )
 
+    def feed(self):
+        """Выборка для лент: связи карточки, без полного текста."""
+        return self.with_related_data_no_comments().without_text().order_by(
+            *POST_ORDERING)
+
+    def without_text(self):
+        """Выборка для списков: полный текст заменяет отрывок."""
+        return self.defer("text")
+
+    def cards(self):
+        """Карточки постов одним запросом .values(), без моделей."""
+        return [
+            PostCard.from_values(row) for row in self.values(*CARD_FIELDS)]
+
+    def search(self, text):
+        """Посты по полнотекстовому запросу, лучшие по bm25 первыми."""
+        query = match_query(text)
+        if not query:
+            return self.none()
+        return self.filter(search_index__document__match=query).order_by(
+            "search_index__rank", "-pub_date")
+
     def published(self):
         """Фильтр для выборки по актуальности поста."""
+        return self.filter(published_filter())
+
+    def due(self):
+        """Отложенные посты, время публикации которых наступило."""
+        return self.filter(is_visible=False).filter(visibility_filter())
+
+    def pending(self):
+        """Опубликованные автором посты, ещё не отмеченные видимыми."""
         return self.filter(
             is_published=True,
+            is_visible=False,
             category__is_published=True,
-            pub_date__lt=datetime.now()
         )
 
-    def annotates(self):
-        """Метод для подсчёта комментария к посту."""
-        return self.annotate(comment_count=Count("comments"))
+    def next_scheduled(self):
+        """Время ближайшей публикации среди ещё не видимых постов или None.
+
+        Если время уже прошло, посты ждут отметки видимыми.
+        """
+        return self.pending().order_by("pub_date").values_list(
+            "pub_date", flat=True).first()
+
+    def visible_to(self, user):
+        """Опубликованные посты и все посты самого пользователя."""
+        visible = published_filter()
+        if user.is_authenticated:
+            visible |= Q(author_id=user.pk)
+        return self.filter(visible)
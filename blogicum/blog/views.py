@@ -1,8 +1,12 @@
-from datetime import datetime
+from http import HTTPStatus
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.paginator import InvalidPage
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.response import TemplateResponse
 from django.views.generic import (
+    View,
     ListView,
     CreateView,
     DetailView,
@@ -11,42 +15,89 @@ from django.views.generic import (
     FormView,
 )
 from django.urls import reverse
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import get_object_or_404
+from django.utils.functional import SimpleLazyObject, cached_property
 
 
 from blog.models import Category, Comments, Post
 
-from .constant import COUNT_POSTS_ON_FRAME
+from .autocomplete import get_index
+from .cache import (
+    FEED_TAG,
+    CachedPage,
+    author_feed_tag,
+    category_feed_tag,
+    category_tag,
+    discard_versioned,
+    feed_cache_key,
+    get_cached_page,
+    get_tag_versions,
+    post_card_tags,
+    post_tag,
+    set_cached_page,
+    unlock_versioned,
+    user_tag,
+)
+from .constant import (
+    AUTOCOMPLETE_LIMIT,
+    COMMENT_ORDERING,
+    COMMENTS_PER_PAGE,
+    COUNT_POSTS_ON_FRAME,
+)
 from .forms import CommentForm, PostForm, ProfilForm
-from .mixins import CommentSuccessMixin, ProfileSuccessMixin
+from .mixins import (
+    CommentSuccessMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    OwnerObjectMixin,
+    PageCacheMixin,
+    ProfileSuccessMixin,
+    ScheduledFeedMixin,
+)
 from .models import User
-from .utils import page_counter, PostQuerySet
+from .utils import CursorPaginator
 
 
-class ProfileListView(ListView):
+class ProfileListView(
+    ConditionalGetMixin,
+    PageCacheMixin,
+    CursorPaginationMixin,
+    ListView,
+):
     """CBV класс для отоброжанеия профиля."""
 
     template_name = "blog/profile.html"
+    cache_key_params = ("page", "cursor")
+
+    @cached_property
+    def author(self):
+        """Автор, чей профиль открыт."""
+        return get_object_or_404(User, username=self.kwargs["username"])
+
+    def get_cache_scope_tags(self):
+        """Теги ленты автора."""
+        return {author_feed_tag(self.kwargs["username"])}
+
+    def get_cache_object_tags(self, context):
+        """Теги профиля и постов на странице."""
+        return super().get_cache_object_tags(context) | {
+            user_tag(context["profile"].pk)}
+
+    def get_feed_scope(self):
+        """Список постов автора."""
+        return f"author:{self.author.username}", {
+            author_feed_tag(self.author.username),
+            user_tag(self.author.pk),
+        }
 
     def get_queryset(self):
         """фунция выборпи постов с сортировкой по автору."""
-        self.author = get_object_or_404(User, username=self.kwargs["username"])
-        return (
-            Post.objects.filter(author=self.author)
-            .annotate(comment_count=Count("comments"))
-            .order_by("-pub_date")
-        )
+        return Post.objects.feed().filter(author=self.author)
 
     def get_context_data(self, **kwargs):
         """модификация контекста."""
         context = super().get_context_data(**kwargs)
         context["profile"] = self.author
-        model = context["page_obj"] = (
-            Post.objects.filter(author=self.author)
-            .annotate(comment_count=Count("comments"))
-            .order_by("-pub_date")
-        )
-        context["page_obj"] = page_counter(self, model)
         return context
 
 
@@ -66,16 +117,119 @@ class ProfileUpdateView(LoginRequiredMixin, ProfileSuccessMixin, FormView):
         return super().form_valid(form)
 
 
-class PostListView(ListView):
+class PostListView(
+    ConditionalGetMixin,
+    PageCacheMixin,
+    CursorPaginationMixin,
+    ListView,
+):
     """CBV класс для отоброжанеия списка постов."""
 
     model = Post
     template_name = "blog/index.html"
-    paginate_by = COUNT_POSTS_ON_FRAME
+    cache_key_params = ("page", "cursor")
+
+    def get_cache_scope_tags(self):
+        """Теги общей ленты."""
+        return {FEED_TAG}
+
+    def get_feed_scope(self):
+        """Список постов общей ленты."""
+        return "feed", {FEED_TAG}
 
     def get_queryset(self):
         """Выборка актуальных постов."""
-        return PostQuerySet(Post).published().annotates().order_by("-pub_date")
+        return Post.objects.feed().published()
+
+
+class SearchView(ConditionalGetMixin, PageCacheMixin, ListView):
+    """CBV класс полнотекстового поиска по постам."""
+
+    template_name = "blog/search.html"
+    paginate_by = COUNT_POSTS_ON_FRAME
+    cache_key_params = ("q", "page")
+
+    def get_cache_scope_tags(self):
+        """Теги общей ленты: в выдаче любые опубликованные посты."""
+        return {FEED_TAG}
+
+    def get_queryset(self):
+        """Опубликованные посты, подходящие под запрос."""
+        self.query = self.request.GET.get("q", "").strip()
+        return Post.objects.feed().published().search(self.query)
+
+    def get_context_data(self, **kwargs):
+        """Модификация контекста."""
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        return context
+
+
+class AutocompleteView(View):
+    """CBV класс подсказок по префиксу из индекса в памяти."""
+
+    def get(self, request, *args, **kwargs):
+        """Не больше AUTOCOMPLETE_LIMIT подсказок в JSON."""
+        try:
+            limit = int(request.GET.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        limit = max(0, min(limit, AUTOCOMPLETE_LIMIT))
+        results = get_index().lookup(request.GET.get("q", ""), limit)
+        return JsonResponse({"results": results})
+
+
+class BasePostFeedView(ScheduledFeedMixin, View):
+    """CBV класс ленты RSS или Atom с кешем готового XML."""
+
+    feed_class = None
+
+    def get_page_validators(self, versions):
+        """Валидаторы, которые хранятся вместе с XML."""
+        return None
+
+    def restore_page_validators(self, validators):
+        """Валидаторы XML, взятого из кеша."""
+
+    def get(self, request, *args, **kwargs):
+        """XML ленты из кеша или сформированный заново."""
+        key = feed_cache_key(request)
+        page = get_cached_page(key)
+        if page is not None:
+            self.restore_page_validators(page.validators)
+            return HttpResponse(page.content, content_type=page.content_type)
+        versions = get_tag_versions(self.feed_class.get_cache_tags(**kwargs))
+        feed = self.feed_class()
+        try:
+            response = feed(request, *args, **kwargs)
+        except Http404:
+            discard_versioned(key)
+            raise
+        except BaseException:
+            unlock_versioned(key)
+            raise
+        # Last-Modified по дате публикации заменяют валидаторы представления.
+        del response["Last-Modified"]
+        tags = set().union(*map(post_card_tags, feed.cards))
+        versions.update(get_tag_versions(tags - versions.keys()))
+        set_cached_page(
+            key,
+            CachedPage(
+                response.content,
+                response["Content-Type"],
+                self.get_page_validators(versions),
+            ),
+            versions,
+        )
+        return response
+
+
+class PostFeedView(ConditionalGetMixin, BasePostFeedView):
+    """CBV класс ленты постов с ответом 304 для программ чтения лент."""
+
+    def get_versions_cache_key(self):
+        """XML ленты в кеше."""
+        return feed_cache_key(self.request)
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -101,29 +255,14 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostUpdateView(LoginRequiredMixin, UpdateView):
+class PostUpdateView(LoginRequiredMixin, OwnerObjectMixin, UpdateView):
     """CBV класс для редактирования постов."""
 
     model = Post
     template_name = "blog/create.html"
     pk_url_kwarg = "post_id"
     form_class = PostForm
-
-    def get_context_data(self, **kwargs):
-        """Модификации контекста."""
-        context = super().get_context_data(**kwargs)
-        context["form"] = PostForm(
-            instance=get_object_or_404(Post, pk=self.kwargs.get("post_id"))
-        )
-        context["comments"] = self.object.comments.select_related("author")
-        return context
-
-    def dispatch(self, request, *args, **kwargs):
-        """Проверка нахождения объекта в базе."""
-        post = get_object_or_404(Post, id=self.kwargs["post_id"])
-        if self.request.user != post.author:
-            return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
-        return super().dispatch(request, *args, **kwargs)
+    owner_select_related = ("author", "category")
 
     def get_success_url(self):
         """Перенаправление при удачном выполнении."""
@@ -140,76 +279,162 @@ class ProfileSuccessMixin:
         )
 
 
-class PostDeleteView(LoginRequiredMixin, ProfileSuccessMixin, DeleteView):
+class PostDeleteView(
+    LoginRequiredMixin, OwnerObjectMixin, ProfileSuccessMixin, DeleteView
+):
     """CBV класс для удаления постов."""
 
     model = Post
     template_name = "blog/create.html"
     pk_url_kwarg = "post_id"
-
-    def dispatch(self, request, *args, **kwargs):
-        """Проверки нахождения объекта в базе."""
-        post = get_object_or_404(
-            Post,
-            id=kwargs["post_id"],
-        )
-        if post.author != request.user:
-            return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
-        return super().dispatch(request, *args, **kwargs)
+    owner_select_related = ("author", "category")
 
 
-class PostDetailView(DetailView):
+class PostDetailView(
+    ConditionalGetMixin, PageCacheMixin, DetailView
+):
     """CBV класс для отображения подробной информации поста."""
 
     model = Post
     template_name = "blog/detail.html"
     pk_url_kwarg = "post_id"
 
+    def get_versions_cache_key(self):
+        """Валидаторы поста считаются по базе, вместе с Last-Modified."""
+        return None
+
+    def get_change_stamp(self):
+        """Пост, его связи и автор; None, если пост не виден."""
+        return Post.objects.visible_to(self.request.user).filter(
+            pk=self.kwargs["post_id"]
+        ).values(
+            "updated_at",
+            "category__updated_at",
+            "location__updated_at",
+            "author__username",
+        ).first()
+
+    def get_cache_scope_tags(self):
+        """Теги поста."""
+        return {post_tag(self.kwargs["post_id"])}
+
+    def is_page_shared(self, context):
+        """В общий кеш попадают только посты, видимые всем."""
+        return self.object.is_visible
+
+    def get_cache_object_tags(self, context):
+        """Теги поста, его связей и авторов комментариев."""
+        return post_card_tags(self.object) | {
+            user_tag(comment.author_id) for comment in context["comments"]}
+
     def get_context_data(self, **kwargs):
         """Модификация контекста."""
         context = super().get_context_data(**kwargs)
         context["form"] = CommentForm()
-        context["comments"] = self.object.comments.select_related("author")
+        # Комментарии читаются, только если тело страницы отрисовывается.
+        context["comments"] = SimpleLazyObject(CursorPaginator(
+            self.object.comments.select_related("author"),
+            COMMENTS_PER_PAGE,
+            COMMENT_ORDERING,
+        ).page)
         return context
 
     def get_queryset(self):
-        """Выборки постов по его ID."""
-        queryset = PostQuerySet(Post).with_related_data_no_comments().filter(
-            id=self.kwargs.get("post_id")
-        )
+        """Выборка видимого пользователю поста со связями."""
+        return Post.objects.with_related_data_no_comments().visible_to(
+            self.request.user)
 
-        user = queryset.values_list("author__username", flat=True).first()
 
-        if not self.request.user.username == user:
-            queryset = queryset.filter(
-                is_published=True,
-                category__is_published=True,
-                pub_date__lt=datetime.now(),
-            )
+class CommentListView(PageCacheMixin, ListView):
+    """CBV фрагмент со следующей страницей комментариев поста."""
+
+    template_name = "includes/comment_list.html"
+    paginate_by = COMMENTS_PER_PAGE
+    cache_key_params = ("cursor",)
+
+    def get_cache_scope_tags(self):
+        """Теги поста."""
+        return {post_tag(self.kwargs["post_id"])}
 
-        return queryset
+    def get_cache_object_tags(self, context):
+        """Теги авторов комментариев на странице."""
+        return {user_tag(comment.author_id) for comment in context["comments"]}
 
+    def is_page_shared(self, context):
+        """В общий кеш попадают только комментарии постов, видимых всем."""
+        return self.post.is_visible
 
-class CategoryListView(ListView):
+    def get_queryset(self):
+        """Комментарии видимого пользователю поста."""
+        self.post = get_object_or_404(
+            Post.objects.visible_to(self.request.user).only(
+                "pk", "is_visible"),
+            pk=self.kwargs["post_id"],
+        )
+        return self.post.comments.select_related("author")
+
+    def paginate_queryset(self, queryset, page_size):
+        """Страница комментариев по курсору."""
+        paginator = CursorPaginator(queryset, page_size, COMMENT_ORDERING)
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        """Контекст фрагмента: пост и страница комментариев."""
+        context = super().get_context_data(**kwargs)
+        context["post"] = self.post
+        context["comments"] = context["page_obj"]
+        return context
+
+
+class CategoryListView(
+    ConditionalGetMixin,
+    PageCacheMixin,
+    CursorPaginationMixin,
+    ListView,
+):
     """CBV класс для отображения постов по категории."""
 
     template_name = "blog/category.html"
     model = Category
-    paginate_by = COUNT_POSTS_ON_FRAME
+    cache_key_params = ("page", "cursor")
+
+    @cached_property
+    def category(self):
+        """Опубликованная категория из адреса."""
+        return get_object_or_404(
+            Category, slug=self.kwargs["category_slug"], is_published=True
+        )
+
+    def get_cache_scope_tags(self):
+        """Теги ленты категории."""
+        return {category_feed_tag(self.kwargs["category_slug"])}
+
+    def get_cache_object_tags(self, context):
+        """Теги категории и постов на странице."""
+        return super().get_cache_object_tags(context) | {
+            category_tag(context["category"].pk)}
+
+    def get_feed_scope(self):
+        """Список постов категории."""
+        return f"category:{self.category.slug}", {
+            category_feed_tag(self.category.slug),
+            category_tag(self.category.pk),
+        }
 
     def get_context_data(self, **kwargs):
         """Модификации контекста."""
         context = super().get_context_data(**kwargs)
-        context["category"] = get_object_or_404(
-            Category, slug=self.kwargs["category_slug"], is_published=True
-        )
+        context["category"] = self.category
         return context
 
     def get_queryset(self):
         """Выборки постов по определённой категории."""
-        return PostQuerySet(Post).with_related_data_no_comments(
-        ).published().filter(category__slug=self.kwargs.get("category_slug")
-                             ).order_by("-pub_date")
+        return Post.objects.feed().published().filter(
+            category=self.category)
 
 
 class AddCommentView(LoginRequiredMixin, CreateView):
@@ -226,59 +451,60 @@ class AddCommentView(LoginRequiredMixin, CreateView):
         self.posts = get_object_or_404(Post, pk=kwargs["post_id"])
         return super().dispatch(request, *args, **kwargs)
 
+    def is_fragment_request(self):
+        """Форма отправлена скриптом и ждёт только фрагмент страницы."""
+        return self.request.headers.get("X-Requested-With") == (
+            "XMLHttpRequest")
+
     def form_valid(self, form):
         """Проверка валидации формы."""
         form.instance.author = self.request.user
         form.instance.post = self.posts
-        return super().form_valid(form)
+        with transaction.atomic():
+            response = super().form_valid(form)
+        if self.is_fragment_request():
+            return TemplateResponse(
+                self.request,
+                "includes/comment_list.html",
+                {"comments": [self.object], "post": self.posts},
+                status=HTTPStatus.CREATED,
+            )
+        return response
+
+    def form_invalid(self, form):
+        """Форма с ошибками: фрагмент формы или страница целиком."""
+        if self.is_fragment_request():
+            return TemplateResponse(
+                self.request,
+                "includes/comment_form.html",
+                {"form": form, "post_id": self.posts.pk},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        return super().form_invalid(form)
 
     def get_success_url(self):
         """Перенаправление при удачном выполнении."""
         return reverse("blog:post_detail", kwargs={"post_id": self.posts.pk})
 
 
-class CommentUpdateView(LoginRequiredMixin, CommentSuccessMixin, UpdateView):
+class CommentUpdateView(
+    LoginRequiredMixin, OwnerObjectMixin, CommentSuccessMixin, UpdateView
+):
     """CBV класс для редактирования постов."""
 
     model = Comments
     template_name = "blog/comment.html"
     pk_url_kwarg = "comment_id"
+    context_object_name = "comment"
     form_class = CommentForm
 
-    def dispatch(self, request, *args, **kwargs):
-        """Проверка нахождения объекта в базе."""
-        comment = get_object_or_404(
-            Comments,
-            id=kwargs["comment_id"],
-        )
-
-        if comment.author != request.user:
-            return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
-        return super().dispatch(request, *args, **kwargs)
-
-    def get_context_data(self, **kwargs):
-        """Модификации контекста."""
-        context = super().get_context_data(**kwargs)
-        context["comment"] = get_object_or_404(
-            Comments,
-            id=self.kwargs["comment_id"],
-        )
-        return context
 
-
-class DeleteCommentView(LoginRequiredMixin, CommentSuccessMixin, DeleteView):
+class DeleteCommentView(
+    LoginRequiredMixin, OwnerObjectMixin, CommentSuccessMixin, DeleteView
+):
     """CBV класс для удаления комментария."""
 
     model = Comments
     template_name = "blog/comment.html"
     pk_url_kwarg = "comment_id"
-
-    def dispatch(self, request, *args, **kwargs):
-        """Проверки нахождения объекта в базе."""
-        comment = get_object_or_404(
-            Comments,
-            id=kwargs["comment_id"],
-        )
-        if comment.author != request.user:
-            return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
-        return super().dispatch(request, *args, **kwargs)
+    context_object_name = "comment"
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.PublicCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -57,6 +58,8 @@ TEMPLATES = [
 
 LOGIN_REDIRECT_URL = 'blog:index'
 
+LOGIN_URL = 'login'
+
 MEDIA_ROOT = BASE_DIR / 'media'
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
@@ -71,6 +74,19 @@ DATABASES = {
     }
 }
 
+# Версии тегов, страницы и блокировки пересчёта должны быть общими
+# для всех процессов сервера, поэтому кеш лежит в файлах, а не в памяти
+# процесса.
+CACHES = {
+    'default': {
+        'BACKEND': 'blog.cache_backends.SharedFileCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
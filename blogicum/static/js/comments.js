@@ -0,0 +1,73 @@
+// Комментарии без перезагрузки страницы поста: подгрузка следующих
+// страниц и отправка нового комментария. Без JavaScript ссылки
+// и форма работают как обычно.
+const FRAGMENT_HEADERS = {"X-Requested-With": "XMLHttpRequest"};
+
+function parseFragment(html) {
+  const template = document.createElement("template");
+  template.innerHTML = html;
+  // Комментарий, уже добавленный в конец списка, приходит и со своей
+  // страницей: старая копия убирается.
+  template.content.querySelectorAll("[id^='comment-']").forEach(
+    function (comment) {
+      const existing = document.getElementById(comment.id);
+      if (existing) {
+        existing.remove();
+      }
+    }
+  );
+  return template.content;
+}
+
+document.addEventListener("click", function (event) {
+  const link = event.target.closest("[data-more-comments]");
+  if (!link) {
+    return;
+  }
+  event.preventDefault();
+  fetch(link.href, {headers: FRAGMENT_HEADERS})
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.text();
+    })
+    .then(function (html) {
+      link.replaceWith(parseFragment(html));
+    })
+    .catch(function () {
+      window.location.href = link.href;
+    });
+});
+
+document.addEventListener("submit", function (event) {
+  const form = event.target.closest("[data-comment-form]");
+  if (!form) {
+    return;
+  }
+  event.preventDefault();
+  fetch(form.action, {
+    method: "POST",
+    body: new FormData(form),
+    headers: FRAGMENT_HEADERS,
+    credentials: "same-origin",
+    redirect: "manual",
+  })
+    .then(function (response) {
+      if (response.status === 201) {
+        return response.text().then(function (html) {
+          document.getElementById("comments").append(parseFragment(html));
+          form.reset();
+        });
+      }
+      if (response.status === 400) {
+        return response.text().then(function (html) {
+          form.replaceWith(parseFragment(html));
+        });
+      }
+      throw new Error(response.statusText);
+    })
+    .catch(function () {
+      form.submit();
+    });
+});
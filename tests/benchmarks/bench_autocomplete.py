@@ -0,0 +1,86 @@
+"""Подсказки по префиксу: индекс в памяти против LIKE-запроса к базе.
+
+Не входит в обычный прогон тестов, запускается явно:
+
+    pytest tests/benchmarks/bench_autocomplete.py -s
+"""
+import random
+import timeit
+
+import pytest
+
+from blog.autocomplete import AutocompleteIndex
+from blog.constant import AUTOCOMPLETE_LIMIT
+from blog.models import Post
+
+ROWS = 50_000
+NUMBER = 200
+WORDS = (
+    "горы", "море", "поход", "город", "рецепт", "кофе", "север", "остров",
+    "поезд", "музей", "закат", "лес", "река", "озеро", "дорога", "рынок",
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def titles(count):
+    rand = random.Random(0)
+    for pk in range(1, count + 1):
+        yield " ".join(rand.choice(WORDS) for _ in range(5)) + f" {pk}"
+
+
+def test_autocomplete_lookup(capsys, mixer, user, published_category):
+    index = AutocompleteIndex()
+    index.load(
+        ("post", pk, title, pk)
+        for pk, title in enumerate(titles(ROWS), start=1))
+    Post.objects.bulk_create(
+        Post(title=title, text="", author=user, category=published_category,
+             pub_date="2020-01-01T00:00Z", is_published=True, is_visible=True)
+        for title in titles(ROWS // 10))
+    queries = ["г", "по", "озе", "дорог", "ры"]
+    results = {
+        f"index, {ROWS} rows": lambda: [
+            index.lookup(prefix, AUTOCOMPLETE_LIMIT) for prefix in queries],
+        f"icontains, {ROWS // 10} rows": lambda: [
+            list(Post.objects.filter(title__icontains=prefix).values_list(
+                "pk", "title")[:AUTOCOMPLETE_LIMIT]) for prefix in queries],
+    }
+    timings = {
+        name: min(timeit.repeat(func, number=NUMBER, repeat=3))
+        / NUMBER / len(queries)
+        for name, func in results.items()
+    }
+    with capsys.disabled():
+        print(f"\nOne autocomplete lookup, best of 3 x {NUMBER}:")
+        for name, elapsed in timings.items():
+            print(f"  {name:<24} {elapsed * 1e6:8.2f} us")
+        print(
+            f"  index: {len(index)} entries, {index.key_count} keys, "
+            f"{index.memory_usage() / 2 ** 20:.1f} MiB")
+
+
+def test_category_rebuild(capsys):
+    rows = [
+        ("post", pk, title, pk)
+        for pk, title in enumerate(titles(ROWS), start=1)]
+    changed = [(pk, f"{title} new", pk) for _, pk, title, _ in rows[::10]]
+
+    def one_by_one():
+        for pk, title, url_arg in changed:
+            index.add("post", pk, title, url_arg)
+
+    timings = {}
+    for name, func in {
+        "add per post": one_by_one,
+        "replace in bulk": lambda: index.replace("post", changed),
+    }.items():
+        index = AutocompleteIndex()
+        index.load(rows)
+        start = timeit.default_timer()
+        func()
+        timings[name] = timeit.default_timer() - start
+    with capsys.disabled():
+        print(f"\nRebuild {len(changed)} posts of a category, {ROWS} rows:")
+        for name, elapsed in timings.items():
+            print(f"  {name:<24} {elapsed * 1e3:8.1f} ms")
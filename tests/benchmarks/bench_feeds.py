@@ -0,0 +1,85 @@
+"""Ленты RSS: отрисовка, XML из кеша и ответ 304.
+
+Не входит в обычный прогон тестов, запускается явно:
+
+    pytest tests/benchmarks/bench_feeds.py -s
+"""
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Category, Post
+from timing import best_of
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = int(os.environ.get("BENCH_POSTS", 20_000))
+N_CATEGORIES = 20
+REPEAT = 20
+
+
+@pytest.fixture
+def posts(user):
+    Category.objects.bulk_create(
+        Category(title=f"Категория {index}", description="Описание",
+                 slug=f"category-{index}")
+        for index in range(N_CATEGORIES)
+    )
+    categories = list(Category.objects.order_by("pk"))
+    now = timezone.now()
+    Post.objects.bulk_create(
+        (
+            Post(
+                title=f"Пост {index}",
+                text="Текст поста",
+                excerpt="Текст поста",
+                pub_date=now - timedelta(minutes=index + 1),
+                author=user,
+                category=categories[index % N_CATEGORIES],
+                is_visible=True,
+            )
+            for index in range(N_POSTS)
+        ),
+        batch_size=1000,
+    )
+    return categories
+
+
+def test_feed_not_modified(client, user, posts, capsys):
+    feeds = {
+        "site": "/feed/",
+        "category": f"/category/{posts[0].slug}/feed/",
+        "author": f"/profile/{user.username}/feed/",
+    }
+    rows = []
+    for name, url in feeds.items():
+        def render():
+            cache.clear()
+            client.get(url)
+
+        etag = client.get(url)["ETag"]
+        cached = best_of(lambda: client.get(url), REPEAT)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        # ETag берётся из версий тегов в кеше, база не читается.
+        assert len(queries) == 0
+        rows.append((
+            name,
+            best_of(render, REPEAT),
+            cached,
+            best_of(lambda: client.get(url, HTTP_IF_NONE_MATCH=etag), REPEAT),
+        ))
+
+    with capsys.disabled():
+        print(f"\nRSS feeds over {N_POSTS} posts, best of {REPEAT}, ms:")
+        print(f"  {'feed':<10}{'render':>10}{'cached':>10}{'304':>10}")
+        for name, render, cached, not_modified in rows:
+            print(
+                f"  {name:<10}{render:>10.2f}{cached:>10.2f}"
+                f"{not_modified:>10.2f}")
@@ -0,0 +1,52 @@
+"""Страницы для вошедшего пользователя: полная отрисовка и общее тело.
+
+Не входит в обычный прогон тестов, запускается явно:
+
+    pytest tests/benchmarks/bench_hole_punching.py -s
+"""
+import os
+
+import pytest
+from django.core.cache import cache
+
+from blog.models import Comments
+from timing import best_of
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS = int(os.environ.get("BENCH_COMMENTS", 20))
+REPEAT = 50
+
+
+def test_authenticated_shared_body(
+        mixer, client, user_client, another_user,
+        post_with_published_location, capsys):
+    post = post_with_published_location
+    mixer.cycle(N_COMMENTS).blend(Comments, post=post, author=another_user)
+    pages = {
+        "index": "/",
+        "detail": f"/posts/{post.id}/",
+        "profile": f"/profile/{post.author.username}/",
+    }
+    rows = []
+    for name, url in pages.items():
+        def render():
+            cache.clear()
+            user_client.get(url)
+
+        user_client.get(url)
+        rows.append((
+            name,
+            best_of(render, REPEAT),
+            best_of(lambda: user_client.get(url), REPEAT),
+            best_of(lambda: client.get(url), REPEAT),
+        ))
+
+    with capsys.disabled():
+        print(f"\nPages with {N_COMMENTS} comments, best of {REPEAT}, ms:")
+        print(
+            f"  {'page':<10}{'render':>10}{'shared':>10}{'anonymous':>11}")
+        for name, render, shared, anonymous in rows:
+            print(
+                f"  {name:<10}{render:>10.2f}{shared:>10.2f}"
+                f"{anonymous:>11.2f}")
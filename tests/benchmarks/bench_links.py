@@ -0,0 +1,41 @@
+"""Стоимость адресов одной карточки: reverse() против build_url().
+
+Не входит в обычный прогон тестов, запускается явно:
+
+    pytest tests/benchmarks/bench_links.py -s
+"""
+import timeit
+
+from django.urls import reverse
+
+from blog.links import build_url
+
+NUMBER = 10_000
+
+
+def card_urls_reverse():
+    reverse("blog:post_detail", args=(123,))
+    reverse("blog:profile", args=("author",))
+    reverse("blog:category_posts", args=("travel",))
+
+
+def card_urls_build():
+    build_url("blog:post_detail", 123)
+    build_url("blog:profile", "author")
+    build_url("blog:category_posts", "travel")
+
+
+def test_card_urls(capsys):
+    assert build_url("blog:profile", "author") == reverse(
+        "blog:profile", args=("author",))
+    results = {
+        name: min(timeit.repeat(func, number=NUMBER, repeat=5)) / NUMBER
+        for name, func in (
+            ("reverse()", card_urls_reverse),
+            ("build_url()", card_urls_build),
+        )
+    }
+    with capsys.disabled():
+        print(f"\nURLs of one post card, best of 5 x {NUMBER}:")
+        for name, elapsed in results.items():
+            print(f"  {name:<12} {elapsed * 1e6:8.2f} us")
@@ -0,0 +1,73 @@
+"""Сравнение первой и 5000-й страницы ленты: OFFSET против курсора.
+
+Не входит в обычный прогон тестов, запускается явно:
+
+    pytest tests/benchmarks/bench_pagination.py -s
+"""
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.paginator import Paginator
+from django.utils import timezone
+
+from blog.constant import COUNT_POSTS_ON_FRAME, POST_ORDERING
+from blog.models import Category, Post
+from blog.utils import CURSOR_NEXT, CursorPaginator
+from timing import best_of
+
+pytestmark = [pytest.mark.django_db]
+
+DEEP_PAGE = 5000
+N_POSTS = int(
+    os.environ.get("BENCH_POSTS", DEEP_PAGE * COUNT_POSTS_ON_FRAME + 10))
+REPEAT = 5
+
+
+@pytest.fixture
+def feed(user):
+    category = Category.objects.create(
+        title="Лента", description="Лента", slug="bench")
+    now = timezone.now()
+    Post.objects.bulk_create(
+        (
+            Post(
+                title=f"Пост {index}",
+                text="Текст",
+                pub_date=now - timedelta(minutes=index),
+                author=user,
+                category=category,
+                is_visible=True,
+            )
+            for index in range(N_POSTS)
+        ),
+        batch_size=5000,
+    )
+    return Post.objects.filter(is_visible=True, category=category)
+
+
+def test_offset_vs_cursor(feed, capsys):
+    queryset = feed.order_by(*POST_ORDERING)
+    offset = Paginator(queryset, COUNT_POSTS_ON_FRAME)
+    cursors = CursorPaginator(queryset, COUNT_POSTS_ON_FRAME)
+    anchor = offset.page(DEEP_PAGE - 1)[COUNT_POSTS_ON_FRAME - 1]
+    deep_cursor = cursors.encode(anchor, CURSOR_NEXT)
+
+    assert (
+        [post.id for post in offset.page(DEEP_PAGE)]
+        == [post.id for post in cursors.page(deep_cursor)]
+    )
+    results = {
+        "offset, page 1": best_of(
+            lambda: list(Paginator(queryset, COUNT_POSTS_ON_FRAME).page(1)),
+            REPEAT),
+        f"offset, page {DEEP_PAGE}": best_of(
+            lambda: list(offset.page(DEEP_PAGE).object_list), REPEAT),
+        "cursor, page 1": best_of(lambda: list(cursors.page()), REPEAT),
+        f"cursor, page {DEEP_PAGE}": best_of(
+            lambda: list(cursors.page(deep_cursor)), REPEAT),
+    }
+    with capsys.disabled():
+        print(f"\n{N_POSTS} posts, best of {REPEAT}:")
+        for name, elapsed in results.items():
+            print(f"  {name:<20} {elapsed:8.3f} ms")
@@ -0,0 +1,67 @@
+"""Сравнение карточек PostCard и экземпляров Post на странице из 1000 постов.
+
+Не входит в обычный прогон тестов, запускается явно:
+
+    pytest tests/benchmarks/bench_post_cards.py -s
+"""
+import tracemalloc
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.cards import as_card
+from blog.models import Category, Location, Post
+from timing import best_of
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 1000
+REPEAT = 5
+
+
+def measure(func):
+    elapsed = best_of(func, REPEAT)
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024, result
+
+
+@pytest.fixture
+def page(user):
+    category = Category.objects.create(
+        title="Лента", description="Лента", slug="bench")
+    location = Location.objects.create(name="Место")
+    now = timezone.now()
+    Post.objects.bulk_create(
+        (
+            Post(
+                title=f"Пост {index}",
+                text="Текст " * 100,
+                excerpt="Текст",
+                pub_date=now - timedelta(minutes=index + 1),
+                author=user,
+                category=category,
+                location=location,
+                is_visible=True,
+            )
+            for index in range(N_POSTS)
+        ),
+    )
+    return Post.objects.feed().published()[:N_POSTS]
+
+
+def test_cards_vs_models(page, capsys):
+    results = {
+        "Post instances": measure(lambda: list(page.all())),
+        "Post -> PostCard": measure(
+            lambda: [as_card(post) for post in page.all()]),
+        "PostCard via values()": measure(lambda: page.all().cards()),
+    }
+    assert len(results["PostCard via values()"][2]) == N_POSTS
+    with capsys.disabled():
+        print(f"\n{N_POSTS} posts, best of {REPEAT}:")
+        for name, (elapsed, peak, _) in results.items():
+            print(f"  {name:<22} {elapsed:8.3f} ms {peak:10.1f} KiB peak")
@@ -0,0 +1,73 @@
+"""Поиск по 100 000 постов: icontains против FTS5.
+
+Не входит в обычный прогон тестов, запускается явно:
+
+    pytest tests/benchmarks/bench_search.py -s
+"""
+import os
+import random
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.constant import COUNT_POSTS_ON_FRAME
+from blog.models import Category, Post
+from timing import best_of
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = int(os.environ.get("BENCH_POSTS", 100_000))
+REPEAT = 5
+WORDS = [f"слово{index}" for index in range(5000)]
+NEEDLE = "редкослово"
+
+
+@pytest.fixture
+def posts(user):
+    category = Category.objects.create(
+        title="Лента", description="Лента", slug="bench")
+    now = timezone.now()
+    rng = random.Random(0)
+
+    def text(index):
+        words = rng.choices(WORDS, k=80)
+        if index % 1000 == 0:
+            words.append(NEEDLE)
+        return " ".join(words)
+
+    Post.objects.bulk_create(
+        (
+            Post(
+                title=f"Пост {index}",
+                text=text(index),
+                excerpt="",
+                pub_date=now - timedelta(minutes=index + 1),
+                author=user,
+                category=category,
+                is_visible=True,
+            )
+            for index in range(N_POSTS)
+        ),
+        batch_size=5000,
+    )
+
+
+def test_icontains_vs_fts(posts, capsys):
+    feed = Post.objects.feed().published()
+    scan = feed.filter(text__icontains=NEEDLE)
+    assert {post.pk for post in feed.search(NEEDLE)} == {
+        post.pk for post in scan}
+
+    results = {
+        "icontains, page": best_of(
+            lambda: list(scan.all()[:COUNT_POSTS_ON_FRAME]), REPEAT),
+        "icontains, count": best_of(lambda: scan.all().count(), REPEAT),
+        "fts5 bm25, page": best_of(
+            lambda: list(feed.search(NEEDLE)[:COUNT_POSTS_ON_FRAME]), REPEAT),
+        "fts5, count": best_of(feed.search(NEEDLE).count, REPEAT),
+    }
+    with capsys.disabled():
+        print(f"\n{N_POSTS} posts, best of {REPEAT}:")
+        for name, elapsed in results.items():
+            print(f"  {name:<18} {elapsed:9.3f} ms")
@@ -0,0 +1,12 @@
+"""Общие помощники замеров времени для бенчмарков."""
+import time
+
+
+def best_of(func, repeat):
+    """Лучшее из repeat выполнений func, в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
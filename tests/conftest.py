@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,17 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from blog.autocomplete import index
+
+    cache.clear()
+    index.clear()
+    yield
+    cache.clear()
+    index.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,184 @@
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import autocomplete
+from blog.autocomplete import AutocompleteIndex, get_index, index
+from blog.constant import AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_REFRESH
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, **kwargs):
+        kwargs.setdefault("is_published", True)
+        kwargs.setdefault("category", published_category)
+        return mixer.blend(
+            Post, author=user, title=title,
+            pub_date=timezone.now() - timedelta(days=1), **kwargs)
+    return make
+
+
+def labels(prefix, limit=AUTOCOMPLETE_LIMIT):
+    return sorted(
+        (item["type"], item["label"])
+        for item in get_index().lookup(prefix, limit))
+
+
+def test_lookup_by_word_prefix():
+    entries = AutocompleteIndex()
+    entries.load([
+        ("post", 1, "Горные Походы", 1),
+        ("post", 2, "Поход в горы", 2),
+        ("user", 3, "gorets", "gorets"),
+    ])
+    assert [item["label"] for item in entries.lookup("ПОХ", 10)] == [
+        "Поход в горы", "Горные Походы"]
+    assert {item["label"] for item in entries.lookup("гор", 10)} == {
+        "Горные Походы", "Поход в горы"}
+    assert entries.lookup("gor", 10) == [
+        {"type": "user", "label": "gorets", "url": "/profile/gorets/"}]
+    assert len(entries.lookup("г", 1)) == 1
+    assert entries.lookup("  ", 10) == []
+    entries.remove("post", 1)
+    assert [item["label"] for item in entries.lookup("пох", 10)] == [
+        "Поход в горы"]
+
+
+def test_long_prefix_is_checked_against_label():
+    entries = AutocompleteIndex()
+    title = "Очень длинный заголовок поста про путешествие на север"
+    entries.load([("post", 1, title, 1), ("post", 2, title[:-5], 2)])
+    assert [item["label"] for item in entries.lookup(title, 10)] == [title]
+
+
+def test_index_holds_only_visible_objects(
+    make_post, user, posts_with_unpublished_category
+):
+    make_post("Видимый пост")
+    make_post("Черновик поста", is_published=False)
+    assert labels("пост") == [("post", "Видимый пост")]
+    assert labels(user.username) == [("user", user.username)]
+
+
+def test_signals_update_loaded_index(make_post, published_category, user):
+    post = make_post("Первый пост")
+    get_index()
+    second = make_post("Второй пост")
+    assert labels("пост") == [("post", "Второй пост"), ("post", "Первый пост")]
+    post.title = "Переименованный"
+    post.save()
+    assert labels("перв") == []
+    assert labels("переим") == [("post", "Переименованный")]
+    second.is_published = False
+    second.save()
+    assert labels("втор") == []
+    published_category.is_published = False
+    published_category.save()
+    assert labels("переим") == []
+    assert labels(published_category.title) == []
+    published_category.is_published = True
+    published_category.save()
+    assert labels("переим") == [("post", "Переименованный")]
+    post.delete()
+    assert labels("переим") == []
+    user.is_active = False
+    user.save()
+    assert labels(user.username) == []
+
+
+def test_category_delete_removes_its_posts(make_post, published_category):
+    make_post("Пост категории")
+    get_index()
+    published_category.delete()
+    assert labels("пост") == []
+
+
+def test_endpoint_is_bounded_and_skips_db(
+    make_post, client, django_assert_num_queries
+):
+    for number in range(AUTOCOMPLETE_LIMIT + 2):
+        make_post(f"Пост номер {number}")
+    client.get("/autocomplete/", {"q": "пост"})
+    with django_assert_num_queries(0):
+        response = client.get("/autocomplete/", {"q": "ПОСТ", "limit": 100})
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()["results"]
+    assert len(results) == AUTOCOMPLETE_LIMIT
+    assert all(item["type"] == "post" for item in results)
+    assert results[0]["url"].startswith("/posts/")
+    response = client.get("/autocomplete/", {"q": "пост", "limit": "2"})
+    assert len(response.json()["results"]) == 2
+    response = client.get("/autocomplete/", {"q": "пост", "limit": "x"})
+    assert len(response.json()["results"]) == AUTOCOMPLETE_LIMIT
+
+
+def test_memory_report(make_post, capsys):
+    make_post("Пост для отчёта")
+    call_command("autocomplete_stats")
+    out = capsys.readouterr().out
+    assert "Записей: " in out and "КиБ" in out
+    assert index.memory_usage() > 0
+
+
+@pytest.mark.parametrize("bulk_update", [1, 100])
+def test_replace_rebuilds_entries_of_one_kind(monkeypatch, bulk_update):
+    monkeypatch.setattr(
+        autocomplete, "AUTOCOMPLETE_BULK_UPDATE", bulk_update)
+    entries = AutocompleteIndex()
+    entries.load([
+        ("post", 1, "Горные походы", 1),
+        ("post", 2, "Морские походы", 2),
+        ("category", 1, "Походы", "hikes"),
+    ])
+    entries.replace("post", [(2, "Речные сплавы", 2)], removed=[1])
+    assert [item["label"] for item in entries.lookup("пох", 10)] == [
+        "Походы"]
+    assert [item["label"] for item in entries.lookup("спл", 10)] == [
+        "Речные сплавы"]
+    assert len(entries) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stale_index_reloads_in_background(make_post, monkeypatch):
+    first = make_post("Первый пост")
+    get_index()
+    Post.objects.filter(pk=first.pk).update(title="Тихо переименованный")
+    index.loaded_at -= AUTOCOMPLETE_REFRESH + 1
+
+    read_rows = autocomplete._rows
+    started = threading.Event()
+    release = threading.Event()
+    reloads = []
+
+    def slow_rows():
+        reloads.append(1)
+        rows = list(read_rows())
+        started.set()
+        release.wait(5)
+        return rows
+
+    monkeypatch.setattr(autocomplete, "_rows", slow_rows)
+    try:
+        # Пока индекс перечитывается, запросы получают прежний.
+        assert labels("перв") == [("post", "Первый пост")]
+        assert started.wait(5)
+        make_post("Новый пост")
+        assert labels("тихо") == []
+    finally:
+        release.set()
+        for thread in threading.enumerate():
+            if thread.name == autocomplete.RELOAD_THREAD_NAME:
+                thread.join(5)
+
+    assert reloads == [1]
+    assert labels("перв") == []
+    assert labels("тихо") == [("post", "Тихо переименованный")]
+    # Пост, добавленный во время перечитывания, не потерян.
+    assert labels("нов") == [("post", "Новый пост")]
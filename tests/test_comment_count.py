@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comments, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def stored_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk)
+
+
+def test_counter_follows_comment_views(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    for _ in range(2):
+        response = user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.FOUND
+    assert stored_count(post) == 2
+
+    comment = Comments.objects.filter(post=post).first()
+    response = user_client.post(
+        f"/posts/{post.id}/delete_comment/{comment.id}")
+    assert response.status_code == HTTPStatus.FOUND
+    assert stored_count(post) == 1
+
+
+def test_counter_follows_cascade_delete(
+        mixer, another_user, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comments, post=post, author=another_user)
+    mixer.blend(Comments, post=post)
+    assert stored_count(post) == 4
+
+    another_user.delete()
+    assert stored_count(post) == 1
+
+    Comments.objects.filter(post=post).delete()
+    assert stored_count(post) == 0
+
+
+def test_recount_command_repairs_counter(
+        mixer, post_with_published_location, posts_with_unpublished_category):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comments, post=post)
+    Post.objects.update(comment_count=42)
+
+    call_command("recount_comments", batch_size=2)
+
+    assert stored_count(post) == 3
+    assert not Post.objects.exclude(pk=post.pk).exclude(
+        comment_count=0).exists()
@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+from blog.models import Comments
+
+pytestmark = [pytest.mark.django_db]
+
+XHR = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+
+@pytest.fixture
+def url(post_with_published_location):
+    return f"/posts/{post_with_published_location.id}/comment/"
+
+
+def test_fragment_mode_returns_new_comment(
+        user_client, post_with_published_location, url):
+    response = user_client.post(url, {"text": "Новый комментарий"}, **XHR)
+    assert response.status_code == HTTPStatus.CREATED
+    content = response.content.decode()
+    comment = Comments.objects.get()
+    assert "Новый комментарий" in content
+    assert f'id="comment-{comment.id}"' in content
+    assert "<html" not in content
+    assert comment.post == post_with_published_location
+
+
+def test_plain_post_still_redirects(
+        user_client, post_with_published_location, url):
+    response = user_client.post(url, {"text": "Новый комментарий"})
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f"/posts/{post_with_published_location.id}/"
+
+
+def test_fragment_mode_returns_form_errors(user_client, url):
+    response = user_client.post(url, {"text": ""}, **XHR)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "data-comment-form" in response.content.decode()
+    assert not Comments.objects.exists()
+
+
+def test_fragment_mode_keeps_auth_and_csrf(client, user, url):
+    response = client.post(url, {"text": "Аноним"}, **XHR)
+    assert response.status_code == HTTPStatus.FOUND
+    assert "/login/" in response.url
+
+    csrf_client = Client(enforce_csrf_checks=True)
+    csrf_client.force_login(user)
+    response = csrf_client.post(url, {"text": "Без токена"}, **XHR)
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert not Comments.objects.exists()
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from bs4 import BeautifulSoup
+from django.utils import timezone
+
+from blog.constant import COMMENTS_PER_PAGE
+from blog.models import Comments
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS = COMMENTS_PER_PAGE * 2 + 3
+
+
+@pytest.fixture
+def commented_post(post_with_published_location, another_user):
+    post = post_with_published_location
+    created = timezone.now() - timedelta(days=1)
+    Comments.objects.bulk_create(
+        Comments(post=post, author=another_user, text=f"Комментарий {index}")
+        for index in range(N_COMMENTS)
+    )
+    # Комментарии парами с одинаковым временем: порядок решает id.
+    for index, comment in enumerate(post.comments.order_by("id")):
+        comment.created_at = created + timedelta(seconds=index // 2)
+        comment.save(update_fields=["created_at"])
+    return post
+
+
+def comment_ids(content):
+    soup = BeautifulSoup(content, "html.parser")
+    return [
+        int(link["name"].split("_")[1])
+        for link in soup.find_all("a", attrs={"name": True})
+        if link["name"].startswith("comment_")
+    ]
+
+
+def more_link(content):
+    soup = BeautifulSoup(content, "html.parser")
+    link = soup.find("a", attrs={"data-more-comments": True})
+    return link["href"] if link else None
+
+
+def test_comments_are_loaded_in_batches(client, commented_post):
+    expected = list(
+        commented_post.comments.order_by("created_at", "id")
+        .values_list("id", flat=True))
+    response = client.get(f"/posts/{commented_post.id}/")
+    content = response.content.decode()
+    seen = comment_ids(content)
+    assert len(seen) == COMMENTS_PER_PAGE
+
+    href = more_link(content)
+    while href:
+        assert href.startswith(f"/posts/{commented_post.id}/comments/")
+        fragment = client.get(href)
+        assert fragment.status_code == HTTPStatus.OK
+        fragment_content = fragment.content.decode()
+        assert "<html" not in fragment_content
+        seen += comment_ids(fragment_content)
+        href = more_link(fragment_content)
+    assert seen == expected
+
+
+def test_detail_queries_do_not_grow_with_comments(
+        client, commented_post, django_assert_num_queries):
+    # Время ближайшей публикации, валидаторы, пост со связями
+    # и первая страница комментариев.
+    with django_assert_num_queries(4):
+        client.get(f"/posts/{commented_post.id}/")
+
+
+def test_fragment_follows_post_visibility(
+        client, user_client, commented_post):
+    commented_post.is_published = False
+    commented_post.save()
+    url = f"/posts/{commented_post.id}/comments/"
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert user_client.get(url).status_code == HTTPStatus.OK
+
+
+def test_fragment_rejects_broken_cursor(client, commented_post):
+    response = client.get(
+        f"/posts/{commented_post.id}/comments/?cursor=broken")
+    assert response.status_code == HTTPStatus.NOT_FOUND
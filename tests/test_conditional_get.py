@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Comments
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def pages(post_with_published_location):
+    post = post_with_published_location
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "detail": f"/posts/{post.id}/",
+        "profile": f"/profile/{post.author.username}/",
+        "search": f"/search/?q={post.title.split()[0]}",
+    }
+
+
+def validators(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response["ETag"], response.get("Last-Modified")
+
+
+@pytest.mark.parametrize(
+    "page, queries",
+    [
+        ("index", 0),
+        ("category", 0),
+        ("detail", 1),
+        ("profile", 0),
+        ("search", 0),
+    ],
+)
+def test_repeat_visit_gets_not_modified(
+        client, pages, page, queries, django_assert_num_queries):
+    url = pages[page]
+    etag, _ = validators(client, url)
+    # У списков ETag сверяется с версиями тегов страницы в кеше,
+    # у поста — по одному запросу к базе; без выборки и отрисовки.
+    with django_assert_num_queries(queries):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.templates
+    assert response["ETag"] == etag
+
+
+def test_only_detail_has_last_modified(client, pages):
+    for page, url in pages.items():
+        _, last_modified = validators(client, url)
+        assert (last_modified is not None) == (page == "detail")
+    _, last_modified = validators(client, pages["detail"])
+    response = client.get(
+        pages["detail"], HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_cached_page_keeps_validators(
+        client, pages, django_assert_num_queries):
+    etag, _ = validators(client, pages["index"])
+    with django_assert_num_queries(0):
+        response = client.get(pages["index"])
+    assert response["ETag"] == etag
+
+
+def test_etag_depends_on_user(client, user_client, another_user_client, pages):
+    etags = {
+        validators(visitor, pages["detail"])[0]
+        for visitor in (client, user_client, another_user_client)
+    }
+    assert len(etags) == 3
+    etag, _ = validators(user_client, pages["detail"])
+    response = client.get(pages["detail"], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_comment_changes_post_validators(
+        client, mixer, pages, post_with_published_location, another_user):
+    etags = [validators(client, pages["detail"])[0]]
+    comment = mixer.blend(
+        Comments, post=post_with_published_location, author=another_user)
+    etags.append(validators(client, pages["detail"])[0])
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    etags.append(validators(client, pages["detail"])[0])
+    comment.delete()
+    etags.append(validators(client, pages["detail"])[0])
+    assert len(set(etags)) == len(etags)
+    for etag in etags[:-1]:
+        response = client.get(pages["detail"], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+
+def test_related_changes_change_feed_validators(
+        client, pages, post_with_published_location):
+    post = post_with_published_location
+    seen = {validators(client, pages["category"])[0]}
+    post.category.description = "Новое описание"
+    post.category.save()
+    seen.add(validators(client, pages["category"])[0])
+    post.location.name = "Новое место"
+    post.location.save()
+    seen.add(validators(client, pages["category"])[0])
+    assert len(seen) == 3
+
+    before = validators(client, pages["index"])[0]
+    post.delete()
+    assert validators(client, pages["index"])[0] != before
+
+
+def test_missing_post_has_no_validators(client):
+    response = client.get("/posts/999/", HTTP_IF_NONE_MATCH='"any"')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.parametrize("page", ["index", "category", "profile"])
+def test_removed_post_changes_list_validators(
+        client, mixer, pages, page, post_with_published_location):
+    post = post_with_published_location
+    newer = mixer.blend(
+        "blog.Post", author=post.author, category=post.category,
+        location=post.location, is_published=True)
+    etag, _ = validators(client, pages[page])
+    newer.is_published = False
+    newer.save()
+    response = client.get(pages[page], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    etag = response["ETag"]
+    newer.delete()
+    response = client.get(pages[page], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,101 @@
+import re
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from bs4 import BeautifulSoup
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = N_PER_PAGE * 2 + 5
+
+
+@pytest.fixture
+def posts_with_equal_dates(mixer, user, published_category):
+    now = timezone.now()
+    pub_dates = (
+        now - timedelta(hours=index // 3 + 1) for index in range(N_POSTS)
+    )
+    return mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=pub_dates,
+    )
+
+
+def expected_order(posts):
+    return [
+        post.id for post in sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True)
+    ]
+
+
+def get_page_link(response, text):
+    soup = BeautifulSoup(response.content.decode("utf-8"), "html.parser")
+    for link in soup.find_all("a", class_="page-link"):
+        if link.get_text(strip=True) == text:
+            return link["href"]
+    return None
+
+
+def rendered_ids(response):
+    ids = re.findall(r'href="/posts/(\d+)/"', response.content.decode())
+    return [int(post_id) for post_id in dict.fromkeys(ids)]
+
+
+def walk(client, url, link_text, query=""):
+    pages = []
+    response = client.get(url + query)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        pages.append([post.id for post in response.context["page_obj"]])
+        assert rendered_ids(response) == pages[-1], (
+            "Посты страницы по курсору должны попадать в разметку."
+        )
+        href = get_page_link(response, link_text)
+        if href is None:
+            return pages
+        assert "cursor" in parse_qs(urlparse(href).query), (
+            "Ссылки на соседние страницы ленты должны вести в режим курсора."
+        )
+        response = client.get(url + href)
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_cursor_walk_forward_and_back(
+        client, user, published_category, posts_with_equal_dates, url_name):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    expected = expected_order(posts_with_equal_dates)
+
+    forward = walk(client, url, ">>")
+    assert sum(forward, []) == expected
+    assert all(len(page) <= N_PER_PAGE for page in forward)
+
+    backward = walk(client, url, "<<", query="?cursor=last")
+    assert sum(reversed(backward), []) == expected
+    assert backward[0] == expected[-len(backward[0]):]
+
+
+def test_cursor_page_matches_offset_page(client, posts_with_equal_dates):
+    second = client.get("/?page=2")
+    href = get_page_link(client.get("/"), ">>")
+    by_cursor = client.get("/" + href)
+    assert (
+        [post.id for post in second.context["page_obj"]]
+        == [post.id for post in by_cursor.context["page_obj"]]
+    )
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "bnVsbA", "WyJ4IiwgW11d"])
+def test_invalid_cursor_is_not_found(client, cursor):
+    response = client.get(f"/?cursor={cursor}")
+    assert response.status_code == HTTPStatus.NOT_FOUND
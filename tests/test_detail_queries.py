@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Comments
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def commented_post(mixer, post_with_published_location, another_user):
+    mixer.cycle(5).blend(
+        Comments, post=post_with_published_location, author=another_user)
+    return post_with_published_location
+
+
+def test_anonymous_detail_queries(
+        client, commented_post, django_assert_num_queries):
+    # Время ближайшей публикации (раз в SCHEDULER_INTERVAL), валидаторы,
+    # пост со связями и комментарии с авторами.
+    with django_assert_num_queries(4):
+        response = client.get(f"/posts/{commented_post.id}/")
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_author_detail_queries(
+        user_client, commented_post, django_assert_num_queries):
+    # Время ближайшей публикации, сессия, пользователь, валидаторы,
+    # пост со связями и комментарии с авторами.
+    with django_assert_num_queries(6):
+        response = user_client.get(f"/posts/{commented_post.id}/")
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_unpublished_post_is_visible_to_author_only(
+        user_client, another_user_client, client,
+        unpublished_posts_with_published_locations,
+        django_assert_num_queries):
+    post = unpublished_posts_with_published_locations[0]
+    url = f"/posts/{post.id}/"
+
+    with django_assert_num_queries(6):
+        assert user_client.get(url).status_code == HTTPStatus.OK
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,56 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.constant import EXCERPT_WORDS, MAX_LENGHT_EXCERPT
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"слово{index}" for index in range(5000))
+
+
+@pytest.fixture
+def long_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        text=LONG_TEXT)
+
+
+def test_excerpt_is_computed_on_save(long_post):
+    assert long_post.excerpt.split()[:EXCERPT_WORDS] == (
+        LONG_TEXT.split()[:EXCERPT_WORDS])
+    assert len(long_post.excerpt) <= MAX_LENGHT_EXCERPT
+
+    long_post.text = "Короткий текст"
+    long_post.save(update_fields=["text"])
+    assert Post.objects.get(pk=long_post.pk).excerpt == "Короткий текст"
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_feed_does_not_load_full_text(
+        user_client, long_post, published_category, url_name):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{long_post.author.username}/",
+    }[url_name]
+    with CaptureQueriesContext(connection) as queries:
+        content = user_client.get(url).content.decode()
+
+    assert long_post.excerpt in content
+    assert LONG_TEXT not in content
+    assert not any(
+        '"blog_post"."text"' in query["sql"] for query in queries
+    ), "Список постов не должен загружать полный текст публикаций."
+
+
+def test_backfill_command(long_post, posts_with_unpublished_category):
+    Post.objects.update(excerpt="")
+
+    call_command("backfill_excerpts", batch_size=2)
+
+    for post in Post.objects.all():
+        assert post.excerpt
+    assert Post.objects.get(pk=long_post.pk).excerpt == long_post.excerpt
@@ -0,0 +1,139 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.functional import empty
+
+from blog.mixins import CursorPaginationMixin
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = N_PER_PAGE * 6 + 1
+
+
+@pytest.fixture
+def many_posts(user, published_category):
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f"Пост {index}",
+            text="Текст",
+            excerpt="Текст",
+            is_visible=True,
+            pub_date=now - timedelta(minutes=index + 1),
+            author=user,
+            category=published_category,
+        )
+        for index in range(N_POSTS)
+    )
+
+
+def feed_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    sql = [query["sql"] for query in queries]
+    return response, [
+        query for query in sql
+        if query.startswith('SELECT "blog_post"."id" FROM')
+        or '"__count"' in query
+    ], sql
+
+
+@pytest.fixture(params=["index", "category", "profile"])
+def feed_url(request, user, published_category):
+    return {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[request.param]
+
+
+def test_feed_ids_are_cached_until_feed_changes(
+        user_client, mixer, user, published_category, many_posts, feed_url):
+    response, id_queries, _ = feed_queries(user_client, feed_url)
+    assert len(id_queries) == 1
+    assert response.context["paginator"].count == N_POSTS
+
+    response, id_queries, _ = feed_queries(user_client, f"{feed_url}?page=2")
+    assert not id_queries, "Список id ленты должен браться из кеша."
+
+    post = mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(seconds=90))
+    response, id_queries, _ = feed_queries(user_client, feed_url)
+    assert len(id_queries) == 1
+    assert response.context["paginator"].count == N_POSTS + 1
+    assert post in response.context["page_obj"]
+
+
+def test_page_is_hydrated_by_primary_key(user_client, many_posts, feed_url):
+    expected = list(
+        Post.objects.filter(is_visible=True).order_by("-pub_date", "-id")
+        .values_list("pk", flat=True)[N_PER_PAGE:N_PER_PAGE * 2])
+    user_client.get(feed_url)
+    response, _, sql = feed_queries(user_client, f"{feed_url}?page=2")
+
+    assert [post.pk for post in response.context["page_obj"]] == expected
+    pages = [query for query in sql if '"blog_post"."title"' in query]
+    assert len(pages) == 1
+    assert '"blog_post"."id" IN (' in pages[0]
+    assert "ORDER BY" not in pages[0] and "OFFSET" not in pages[0]
+
+
+def test_page_is_rendered_from_cards(client, many_posts, feed_url):
+    expected = list(
+        Post.objects.filter(is_visible=True).order_by("-pub_date", "-id")
+        .values_list("title", flat=True)[:N_PER_PAGE])
+    response = client.get(feed_url)
+    page_obj = response.context["page_obj"]
+
+    assert [card.title for card in page_obj.cards] == expected
+    # Экземпляры постов при отрисовке не загружались.
+    assert page_obj.object_list._wrapped is empty
+    assert [post.title for post in page_obj] == expected
+
+
+def test_approximate_count(client, monkeypatch, many_posts):
+    limit = N_PER_PAGE * 3
+    monkeypatch.setattr(
+        CursorPaginationMixin, "count_approximate_limit", limit)
+    response, id_queries, _ = feed_queries(client, "/?page=3")
+    paginator = response.context["paginator"]
+    page_obj = response.context["page_obj"]
+
+    assert paginator.approximate
+    assert paginator.count == limit
+    assert f"LIMIT {limit + 1}" in id_queries[0]
+    assert page_obj.has_next() and page_obj.next_cursor
+    assert page_obj.elided_page_range[-1] == paginator.ELLIPSIS
+
+
+def test_elided_page_range_is_rendered(client, many_posts):
+    content = client.get("/").content.decode()
+    assert "?page=2" in content
+    assert "?page=5" not in content
+    assert "?page=7" in content
+    assert "…" in content
+
+
+@pytest.mark.parametrize("page", [4, 7])
+def test_pages_past_approximate_count(client, monkeypatch, many_posts, page):
+    limit = N_PER_PAGE * 3
+    monkeypatch.setattr(
+        CursorPaginationMixin, "count_approximate_limit", limit)
+    expected = list(
+        Post.objects.order_by("-pub_date", "-id").values_list(
+            "title", flat=True)[(page - 1) * N_PER_PAGE:page * N_PER_PAGE])
+    response, _, sql = feed_queries(client, f"/?page={page}")
+    page_obj = response.context["page_obj"]
+
+    assert [post.title for post in page_obj] == expected
+    assert page_obj.number == page
+    assert any("OFFSET" in query for query in sql)
+    assert page_obj.elided_page_range[-1] == page_obj.paginator.ELLIPSIS
+    assert client.get("/?page=8").status_code == 404
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+FULL_TEXT = "Отрывок поста. " + "Продолжение, которого нет в ленте. " * 20
+
+
+@pytest.fixture
+def feed_post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        Post, author=user, category=published_category,
+        location=published_location, is_published=True, title="Пост ленты",
+        text=FULL_TEXT, pub_date=timezone.now() - timedelta(days=1))
+
+
+@pytest.fixture
+def hidden_posts(mixer, user, published_category):
+    return [
+        mixer.blend(
+            Post, author=user, category=published_category,
+            is_published=False, title="Скрытый пост"),
+        mixer.blend(
+            Post, author=user, category=published_category,
+            is_published=True, title="Отложенный пост",
+            pub_date=timezone.now() + timedelta(days=1)),
+    ]
+
+
+@pytest.fixture(params=["site", "category", "author"])
+def feed_urls(request, feed_post):
+    prefix = {
+        "site": "/feed/",
+        "category": f"/category/{feed_post.category.slug}/feed/",
+        "author": f"/profile/{feed_post.author.username}/feed/",
+    }[request.param]
+    return prefix, f"{prefix}atom/"
+
+
+def test_feeds_list_published_posts_with_excerpts(
+        client, feed_urls, feed_post, hidden_posts):
+    rss, atom = feed_urls
+    for url, content_type in (
+        (rss, "application/rss+xml"),
+        (atom, "application/atom+xml"),
+    ):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"].startswith(content_type)
+        content = response.content.decode()
+        assert "Пост ленты" in content
+        assert feed_post.excerpt in content
+        assert FULL_TEXT.strip() not in content
+        assert f"/posts/{feed_post.pk}/" in content
+        assert "Скрытый пост" not in content
+        assert "Отложенный пост" not in content
+
+
+def test_missing_feed_owner_is_not_found(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    assert client.get("/category/missing/feed/").status_code == (
+        HTTPStatus.NOT_FOUND)
+    assert client.get(f"/category/{category.slug}/feed/").status_code == (
+        HTTPStatus.NOT_FOUND)
+    assert client.get("/profile/missing/feed/atom/").status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_feed_answers_not_modified(
+        client, feed_urls, django_assert_num_queries):
+    for url in feed_urls:
+        response = client.get(url)
+        etag = response["ETag"]
+        assert not response.has_header("Last-Modified")
+        # ETag сверяется с версиями тегов XML в кеше, без базы.
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert not response.content
+
+
+def test_feed_body_is_cached_until_post_changes(
+        client, feed_urls, feed_post, django_assert_num_queries):
+    rss, _ = feed_urls
+    first = client.get(rss)
+    # XML и его валидаторы берутся из кеша.
+    with django_assert_num_queries(0):
+        cached = client.get(rss)
+    assert cached.content == first.content
+
+    feed_post.title = "Новый заголовок"
+    feed_post.save()
+    response = client.get(rss, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert response.status_code == HTTPStatus.OK
+    assert "Новый заголовок" in response.content.decode()
+    assert response["ETag"] != first["ETag"]
+
+
+def test_feed_follows_related_changes(client, feed_post):
+    assert feed_post.category.title in client.get("/feed/").content.decode()
+    feed_post.category.title = "Переименованная категория"
+    feed_post.category.save()
+    assert "Переименованная категория" in client.get(
+        "/feed/").content.decode()
+
+
+def test_pages_link_their_feeds(client, feed_post):
+    content = client.get(
+        f"/category/{feed_post.category.slug}/").content.decode()
+    assert 'href="/feed/"' in content
+    assert f'href="/category/{feed_post.category.slug}/feed/atom/"' in content
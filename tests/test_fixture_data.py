@@ -0,0 +1,28 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import F
+
+from blog.models import Category, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def loaded_data():
+    call_command("loaddata", settings.BASE_DIR / "db.json", verbosity=0)
+
+
+def test_fixture_loads(loaded_data):
+    assert Post.objects.count() == 39
+    for model in (Category, Location, Post):
+        assert not model.objects.exclude(updated_at=F("created_at")).exists()
+    assert not Post.objects.filter(excerpt="").exists()
+
+
+def test_fixture_posts_are_shown(loaded_data, client):
+    response = client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["page_obj"]) > 0
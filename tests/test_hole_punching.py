@@ -0,0 +1,156 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.middleware.csrf import _compare_masked_tokens
+from django.test import RequestFactory
+
+from blog.cache import get_cached_page, page_cache_key
+from blog.models import Comments
+
+pytestmark = [pytest.mark.django_db]
+
+EDIT_POST = "Отредактировать публикацию"
+LOGOUT = "Выйти"
+COMMENT_FORM = "Оставить комментарий"
+
+
+@pytest.fixture
+def detail_url(post_with_published_location):
+    return f"/posts/{post_with_published_location.id}/"
+
+
+def cached_content(url):
+    page = get_cached_page(page_cache_key(RequestFactory().get(url)))
+    return page and page.content.decode()
+
+
+def get_html(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response, response.content.decode()
+
+
+def test_shared_copy_has_no_personal_data(user_client, detail_url):
+    _, html = get_html(user_client, detail_url)
+    for personal in (LOGOUT, EDIT_POST, "csrfmiddlewaretoken"):
+        assert personal in html
+    shared = cached_content(detail_url)
+    assert shared is not None
+    assert LOGOUT not in shared
+    assert EDIT_POST not in shared
+    assert "csrfmiddlewaretoken" not in shared
+    assert "<!--personal:" in shared
+
+
+def test_fragments_filled_per_user(
+        user, another_user, user_client, another_user_client, client,
+        detail_url):
+    get_html(user_client, detail_url)
+    _, own = get_html(user_client, detail_url)
+    _, other = get_html(another_user_client, detail_url)
+    _, anonymous = get_html(client, detail_url)
+    assert EDIT_POST in own
+    assert EDIT_POST not in other and EDIT_POST not in anonymous
+    assert COMMENT_FORM in own and COMMENT_FORM in other
+    assert COMMENT_FORM not in anonymous
+    assert f">{another_user.username}</a>" in other
+    assert LOGOUT not in anonymous
+    for html in (own, other, anonymous):
+        assert "<!--personal:" not in html
+        assert "<!--shared-body-->" not in html
+
+
+def test_comment_controls_only_for_owner(
+        mixer, another_user, post_with_published_location, user_client,
+        another_user_client, detail_url):
+    comment = mixer.blend(
+        Comments, post=post_with_published_location, author=another_user)
+    edit_url = (
+        f"/posts/{post_with_published_location.id}"
+        f"/edit_comment/{comment.id}/")
+    get_html(user_client, detail_url)
+    _, owner = get_html(another_user_client, detail_url)
+    _, author = get_html(user_client, detail_url)
+    assert edit_url in owner
+    assert edit_url not in author
+
+
+def test_csrf_token_belongs_to_user(
+        user_client, another_user_client, detail_url):
+    tokens = []
+    for visitor in (user_client, another_user_client):
+        get_html(visitor, detail_url)
+        _, html = get_html(visitor, detail_url)
+        token = re.search(r'name="csrfmiddlewaretoken" value="(\w+)"', html)
+        tokens.append(token[1])
+        assert _compare_masked_tokens(
+            token[1], visitor.cookies[settings.CSRF_COOKIE_NAME].value)
+    assert not _compare_masked_tokens(*tokens)
+
+
+def test_authenticated_hit_reuses_body_and_keeps_context(
+        mixer, another_user, user_client, post_with_published_location,
+        detail_url, django_assert_num_queries):
+    mixer.cycle(3).blend(
+        Comments, post=post_with_published_location, author=another_user)
+    get_html(user_client, detail_url)
+    # Сессия, пользователь, валидаторы и проверка доступа к посту;
+    # комментарии не читаются.
+    with django_assert_num_queries(4):
+        response, _ = get_html(user_client, detail_url)
+    assert response.context["post"] == post_with_published_location
+    templates = {template.name for template in response.templates}
+    assert "blog/detail.html" in templates
+    assert "includes/comments.html" not in templates
+    assert "includes/comment_controls.html" not in templates
+
+
+def test_anonymous_hit_renders_only_header(
+        mixer, another_user, client, post_with_published_location,
+        detail_url):
+    mixer.cycle(3).blend(
+        Comments, post=post_with_published_location, author=another_user)
+    get_html(client, detail_url)
+    response, _ = get_html(client, detail_url)
+    assert [template.name for template in response.templates] == [
+        "includes/header.html"]
+
+
+def test_author_only_page_is_not_shared(
+        user, user_client, client, mixer, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, is_published=False,
+        category=published_category)
+    url = f"/posts/{post.id}/"
+    _, html = get_html(user_client, url)
+    assert post.title in html
+    assert cached_content(url) is None
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_list_pages_share_body(
+        user, user_client, another_user_client, post_with_published_location,
+        django_assert_num_queries):
+    url = f"/profile/{user.username}/"
+    get_html(user_client, url)
+    assert cached_content(url) is not None
+    # Сессия, пользователь и автор профиля; посты страницы не читаются.
+    with django_assert_num_queries(3):
+        response, html = get_html(another_user_client, url)
+    assert post_with_published_location in response.context["page_obj"]
+    assert "includes/paginator.html" not in {
+        template.name for template in response.templates}
+    assert post_with_published_location.title in html
+
+
+def test_stale_body_is_rendered_again(
+        user_client, post_with_published_location, detail_url):
+    get_html(user_client, detail_url)
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    response, html = get_html(user_client, detail_url)
+    assert "Новый заголовок" in html
+    assert "includes/comments.html" in {
+        template.name for template in response.templates}
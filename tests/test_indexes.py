@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+
+from blog.constant import COUNT_POSTS_ON_FRAME
+from blog.models import Post
+from blog.utils import CURSOR_NEXT, CursorPaginator
+from blog.views import CategoryListView, PostListView, ProfileListView
+
+pytestmark = [pytest.mark.django_db]
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def view_queryset(view_class, **kwargs):
+    view = view_class()
+    view.setup(RequestFactory().get("/"), **kwargs)
+    return view.get_queryset()
+
+
+def assert_uses_index(queryset, index_name):
+    plan = query_plan(queryset)
+    assert any(f"USING INDEX {index_name}" in step for step in plan), (
+        f"Запрос должен использовать индекс `{index_name}`: {plan}"
+    )
+    assert not any("TEMP B-TREE" in step for step in plan), (
+        f"Запрос не должен сортировать строки во временном дереве: {plan}"
+    )
+
+
+@pytest.fixture
+def feeds(user, published_category):
+    return {
+        "post_published_feed_idx": view_queryset(PostListView),
+        "post_category_feed_idx": view_queryset(
+            CategoryListView, category_slug=published_category.slug),
+        "post_author_feed_idx": view_queryset(
+            ProfileListView, username=user.username),
+    }
+
+
+@pytest.mark.parametrize(
+    "index_name",
+    [
+        "post_published_feed_idx",
+        "post_category_feed_idx",
+        "post_author_feed_idx",
+    ],
+)
+def test_feed_page_uses_index(feeds, index_name):
+    assert_uses_index(feeds[index_name][:COUNT_POSTS_ON_FRAME], index_name)
+
+
+@pytest.mark.parametrize(
+    "index_name", ["post_published_feed_idx", "post_category_feed_idx"])
+def test_published_feed_does_not_filter_by_category(feeds, index_name):
+    where = str(feeds[index_name].query).split(" WHERE ", 1)[1]
+    assert '"blog_category"' not in where
+
+
+def test_scheduler_uses_index():
+    assert_uses_index(Post.objects.due(), "post_scheduled_idx")
+
+
+@pytest.mark.parametrize(
+    "index_name",
+    [
+        "post_published_feed_idx",
+        "post_category_feed_idx",
+        "post_author_feed_idx",
+    ],
+)
+def test_cursor_page_uses_index(
+        feeds, index_name, post_with_published_location):
+    paginator = CursorPaginator(feeds[index_name], COUNT_POSTS_ON_FRAME)
+    cursor = paginator.encode(post_with_published_location, CURSOR_NEXT)
+    _, values = paginator.decode(cursor)
+    queryset = feeds[index_name].filter(paginator._seek(values, False))
+    assert_uses_index(queryset[:COUNT_POSTS_ON_FRAME], index_name)
+
+
+def test_comment_list_uses_index(post_with_published_location):
+    comments = post_with_published_location.comments.select_related(
+        "author")
+    assert_uses_index(comments, "comments_post_created_idx")
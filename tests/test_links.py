@@ -0,0 +1,40 @@
+import pytest
+from django.urls import reverse, set_script_prefix
+
+from blog.links import build_url
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize(
+    "viewname, args",
+    [
+        ("blog:index", ()),
+        ("blog:post_detail", (42,)),
+        ("blog:profile", ("user.name+tag@mail",)),
+        ("blog:category_posts", ("some-slug_1",)),
+        ("blog:edit_comment", (3, 14)),
+        ("blog:delete_comment", (3, 14)),
+    ],
+)
+def test_build_url_matches_reverse(viewname, args):
+    assert build_url(viewname, *args) == reverse(viewname, args=args)
+
+
+def test_build_url_follows_script_prefix():
+    try:
+        set_script_prefix("/blogicum/")
+        assert build_url("blog:post_detail", 1) == "/blogicum/posts/1/"
+    finally:
+        set_script_prefix("/")
+    assert build_url("blog:post_detail", 1) == "/posts/1/"
+
+
+def test_get_absolute_url(mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comments", post=post)
+    assert post.get_absolute_url() == f"/posts/{post.pk}/"
+    assert post.category.get_absolute_url() == (
+        f"/category/{post.category.slug}/")
+    assert comment.get_absolute_url() == (
+        f"/posts/{post.pk}/#comment_{comment.pk}")
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comments, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def reads_of(table, queries):
+    return [
+        query["sql"] for query in queries
+        if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query[
+            "sql"]
+    ]
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        Comments, post=post_with_published_location, author=user)
+
+
+@pytest.mark.parametrize("method", ["get", "post"])
+def test_post_edit_reads_post_once(
+        user_client, post_with_published_location, method):
+    post = post_with_published_location
+    data = {
+        "title": "Новый заголовок",
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%d %H:%M"),
+        "category": post.category_id,
+        "is_published": True,
+    }
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(user_client, method)(
+            f"/posts/{post.id}/edit/", data=data if method == "post" else {})
+    assert response.status_code in (HTTPStatus.OK, HTTPStatus.FOUND)
+    assert len(reads_of("blog_post", queries)) == 1
+
+
+def test_post_delete_reads_post_once(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert len(reads_of("blog_post", queries)) == 1
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_views_read_comment_once(user_client, own_comment, action):
+    url = f"/posts/{own_comment.post_id}/{action}/{own_comment.id}"
+    if action == "edit_comment":
+        url += "/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(url, data={"text": "Новый текст"})
+    assert response.status_code == HTTPStatus.FOUND
+    assert len(reads_of("blog_comments", queries)) == 1
+
+
+def test_foreign_object_redirects_to_post(
+        another_user_client, own_comment, post_with_published_location):
+    post = post_with_published_location
+    for url in (
+        f"/posts/{post.id}/edit/",
+        f"/posts/{post.id}/delete/",
+        f"/posts/{post.id}/edit_comment/{own_comment.id}/",
+        f"/posts/{post.id}/delete_comment/{own_comment.id}",
+    ):
+        response = another_user_client.post(url)
+        assert response.status_code == HTTPStatus.FOUND
+        assert response["Location"] == f"/posts/{post.id}/"
@@ -0,0 +1,125 @@
+import pytest
+from django.test import override_settings
+
+from blog.models import Comments
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=["locmem", "filebased"])
+def cache_backend(request, tmp_path):
+    backends = {
+        "locmem": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "filebased": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        },
+    }
+    with override_settings(CACHES={"default": backends[request.param]}):
+        yield request.param
+
+
+@pytest.fixture
+def pages(post_with_published_location, post_with_another_category):
+    post = post_with_published_location
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "another_category": (
+            f"/category/{post_with_another_category.category.slug}/"),
+        "detail": f"/posts/{post.id}/",
+        "profile": f"/profile/{post.author.username}/",
+    }
+
+
+def warm(client, pages):
+    for url in pages.values():
+        assert client.get(url).status_code == 200
+
+
+def cached_urls(client, pages, django_assert_num_queries):
+    cached = set()
+    for name, url in pages.items():
+        try:
+            with django_assert_num_queries(0):
+                client.get(url)
+        except pytest.fail.Exception:
+            continue
+        cached.add(name)
+    return cached
+
+
+def test_anonymous_pages_are_cached(
+        cache_backend, client, pages, django_assert_num_queries):
+    warm(client, pages)
+    assert cached_urls(client, pages, django_assert_num_queries) == set(
+        pages)
+
+
+def test_authenticated_pages_are_not_cached(
+        cache_backend, user_client, pages, django_assert_num_queries):
+    warm(user_client, pages)
+    assert not cached_urls(user_client, pages, django_assert_num_queries)
+
+
+def test_post_change_clears_only_its_pages(
+        cache_backend, client, pages, post_with_published_location,
+        django_assert_num_queries):
+    warm(client, pages)
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+
+    assert cached_urls(client, pages, django_assert_num_queries) == {
+        "another_category"}
+    assert "Новый заголовок" in client.get(pages["detail"]).content.decode()
+
+
+def test_comment_clears_post_pages(
+        cache_backend, client, mixer, pages, post_with_published_location,
+        django_assert_num_queries):
+    warm(client, pages)
+    mixer.blend(Comments, post=post_with_published_location)
+
+    assert cached_urls(client, pages, django_assert_num_queries) == {
+        "another_category"}
+    assert "Комментарии (1)" in client.get(pages["index"]).content.decode()
+
+
+def test_related_object_change_clears_pages(
+        cache_backend, client, pages, post_with_published_location,
+        django_assert_num_queries):
+    warm(client, pages)
+    location = post_with_published_location.location
+    location.name = "Новое место"
+    location.save()
+
+    assert not cached_urls(client, pages, django_assert_num_queries)
+    assert "Новое место" in client.get(pages["detail"]).content.decode()
+
+
+def test_unpublished_category_leaves_feed(
+        cache_backend, client, pages, post_with_published_location):
+    warm(client, pages)
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+
+    assert client.get(pages["category"]).status_code == 404
+    assert client.get(pages["detail"]).status_code == 404
+    assert post_with_published_location.title not in client.get(
+        pages["index"]).content.decode()
+
+
+def test_unused_parameters_share_entry(
+        client, pages, django_assert_num_queries):
+    warm(client, pages)
+    with django_assert_num_queries(0):
+        client.get(pages["index"] + "?utm_source=mail&ref=1")
+        client.get(pages["detail"] + "?page=2")
+    assert client.get(pages["index"] + "?page=2").status_code == 404
+    response = client.get("/search/?q=post&utm_source=mail")
+    assert response.status_code == 200
+    with django_assert_num_queries(0):
+        client.get("/search/?utm_source=rss&q=post")
@@ -0,0 +1,32 @@
+import pytest
+
+from blog.cache import POST_CARD_PREFIX, fragment_cache_stats
+from blog.models import Comments
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_card_is_shared_between_listings(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get("/")
+    assert fragment_cache_stats(POST_CARD_PREFIX) == {
+        "hits": 0, "misses": 1, "ratio": 0.0}
+
+    user_client.get(f"/category/{post.category.slug}/")
+    user_client.get(f"/profile/{post.author.username}/")
+    assert fragment_cache_stats(POST_CARD_PREFIX)["hits"] == 2
+
+
+def test_card_is_rendered_again_after_change(
+        user_client, mixer, post_with_published_location):
+    post = post_with_published_location
+    user_client.get("/")
+
+    mixer.blend(Comments, post=post)
+    assert "Комментарии (1)" in user_client.get("/").content.decode()
+
+    post.category.title = "Другая категория"
+    post.category.save()
+    assert "Другая категория" in user_client.get("/").content.decode()
+    assert fragment_cache_stats(POST_CARD_PREFIX)["misses"] == 3
@@ -0,0 +1,40 @@
+import pytest
+from django.template.loader import render_to_string
+
+from blog.cards import PostCard, as_card
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(
+        post_with_published_location, posts_with_unpublished_category):
+    return Post.objects.feed()
+
+
+def test_cards_match_model_instances(feed_posts, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        cards = feed_posts.cards()
+    assert cards == [PostCard.from_post(post) for post in feed_posts]
+    assert not hasattr(cards[0], "__dict__")
+
+
+def test_card_urls_are_precomputed(post_with_published_location):
+    card = as_card(post_with_published_location)
+    assert card.detail_url == f"/posts/{card.pk}/"
+    assert card.author_url == f"/profile/{card.author_username}/"
+    assert card.image_url.endswith(".jpg")
+
+
+def test_card_renders_post_fields(post_with_published_location):
+    post = post_with_published_location
+    html = render_to_string("includes/post_card.html", {"post": as_card(post)})
+    for text in (
+        post.title,
+        post.location.name,
+        post.category.title,
+        f"/category/{post.category.slug}/",
+        f"Комментарии ({post.comment_count})",
+    ):
+        assert text in html
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=[10, 100, 10_000])
+def author_posts(request, user, published_category, published_location):
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f"Пост {index}",
+            text="Текст",
+            excerpt="Текст",
+            is_visible=True,
+            pub_date=now - timedelta(minutes=index),
+            author=user,
+            category=published_category,
+            location=published_location,
+        )
+        for index in range(request.param)
+    )
+    return request.param
+
+
+@pytest.mark.parametrize("page", ["", "?page=2"])
+def test_profile_query_count_is_constant(
+        client, user, author_posts, page, django_assert_num_queries):
+    if page and author_posts <= N_PER_PAGE:
+        page = ""
+    # Время ближайшей публикации, автор, COUNT и одна страница постов
+    # со всеми связями.
+    with django_assert_num_queries(4):
+        response = client.get(f"/profile/{user.username}/{page}")
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == min(author_posts, N_PER_PAGE)
+
+
+def test_profile_cursor_page_skips_count(
+        client, user, author_posts, django_assert_num_queries):
+    # Время ближайшей публикации, автор и одна страница постов
+    # со всеми связями.
+    with django_assert_num_queries(3):
+        response = client.get(f"/profile/{user.username}/?cursor=last")
+    assert response.status_code == 200
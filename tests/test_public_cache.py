@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.utils.cache import get_max_age
+
+from blog.constant import PUBLIC_CACHE_MAX_AGE, PUBLIC_CACHE_STALE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def pages(post_with_published_location):
+    post = post_with_published_location
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "detail": f"/posts/{post.id}/",
+        "profile": f"/profile/{post.author.username}/",
+        "about": "/pages/about/",
+        "rules": "/pages/rules/",
+    }
+
+
+def cache_control(response):
+    return {
+        directive.strip()
+        for directive in response.get("Cache-Control", "").split(",")
+        if directive.strip()
+    }
+
+
+@pytest.mark.parametrize(
+    "page", ["index", "category", "detail", "profile", "about", "rules"])
+def test_anonymous_pages_are_public(client, pages, page):
+    for _ in range(2):
+        response = client.get(pages[page])
+        assert response.status_code == HTTPStatus.OK
+        assert not response.cookies
+        assert "csrfmiddlewaretoken" not in response.content.decode()
+        assert cache_control(response) == {
+            "public",
+            f"max-age={PUBLIC_CACHE_MAX_AGE}",
+            f"stale-while-revalidate={PUBLIC_CACHE_STALE}",
+        }
+        assert "Cookie" in response["Vary"]
+    assert not client.cookies
+
+
+@pytest.mark.parametrize("page", ["index", "detail", "about"])
+def test_authenticated_pages_are_private(user_client, pages, page):
+    response = user_client.get(pages[page])
+    assert response.status_code == HTTPStatus.OK
+    assert cache_control(response) == {"private"}
+    assert get_max_age(response) is None
+
+
+def test_csrf_token_only_on_forms_for_users(client, user_client, pages):
+    response = user_client.get(pages["detail"])
+    assert "csrfmiddlewaretoken" in response.content.decode()
+    assert settings.CSRF_COOKIE_NAME in response.cookies
+    response = user_client.get(pages["index"])
+    assert settings.CSRF_COOKIE_NAME not in response.cookies
+    response = client.get(pages["detail"])
+    assert settings.CSRF_COOKIE_NAME not in response.cookies
+
+
+def test_not_modified_stays_public(client, pages):
+    etag = client.get(pages["index"])["ETag"]
+    response = client.get(pages["index"], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert "public" in cache_control(response)
+
+
+def test_other_responses_are_not_public(client, pages):
+    assert not client.get("/posts/0/").has_header("Cache-Control")
+    assert not client.get("/search/?q=post").has_header("Cache-Control")
+    response = client.get("/auth/login/")
+    assert "public" not in cache_control(response)
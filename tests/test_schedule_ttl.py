@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import cache
+from blog.constant import FEED_IDS_CACHE_TIMEOUT, PAGE_CACHE_TIMEOUT
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+SOON = timedelta(minutes=10)
+
+
+@pytest.fixture
+def scheduled_post(mixer, another_user, another_category):
+    return mixer.blend(
+        Post, author=another_user, category=another_category,
+        is_published=True, pub_date=timezone.now() + SOON)
+
+
+@pytest.fixture
+def later_post(mixer, user, published_category):
+    return mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() + SOON * 3)
+
+
+def test_next_scheduled_per_scope(
+        scheduled_post, later_post, post_with_published_location,
+        published_category, user):
+    assert Post.objects.next_scheduled() == scheduled_post.pub_date
+    assert Post.objects.filter(
+        category=published_category).next_scheduled() == later_post.pub_date
+    assert Post.objects.filter(
+        author=user).next_scheduled() == later_post.pub_date
+    assert Post.objects.filter(
+        author=user, category=scheduled_post.category
+    ).next_scheduled() is None
+
+
+def test_next_scheduled_skips_hidden_posts(scheduled_post):
+    scheduled_post.category.is_published = False
+    scheduled_post.category.save()
+    assert Post.objects.next_scheduled() is None
+
+
+def test_next_scheduled_includes_overdue_posts(scheduled_post):
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - SOON)
+    assert Post.objects.next_scheduled() < timezone.now()
+
+
+@pytest.fixture
+def timeouts(monkeypatch):
+    seen = {}
+    set_versioned = cache.set_versioned
+
+    def remember(key, value, versions, timeout):
+        seen[key.split(":")[0]] = timeout
+        set_versioned(key, value, versions, timeout)
+
+    monkeypatch.setattr("blog.cache.set_versioned", remember)
+    monkeypatch.setattr("blog.utils.set_versioned", remember)
+    return seen
+
+
+@pytest.fixture
+def feed_pages(scheduled_post):
+    return {
+        "index": "/",
+        "category": f"/category/{scheduled_post.category.slug}/",
+        "profile": f"/profile/{scheduled_post.author.username}/",
+    }
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_feed_caches_keep_full_timeout(
+        client, timeouts, feed_pages, url_name):
+    client.get(feed_pages[url_name])
+    assert timeouts == {
+        "page": PAGE_CACHE_TIMEOUT, "feed_ids": FEED_IDS_CACHE_TIMEOUT}
+
+
+@pytest.mark.parametrize("url_name", ["index", "category"])
+def test_cached_feed_shows_post_once_due(
+        client, monkeypatch, feed_pages, scheduled_post, url_name):
+    url = feed_pages[url_name]
+    assert scheduled_post.title not in client.get(url).content.decode()
+    later = timezone.now() + SOON
+    monkeypatch.setattr(timezone, "now", lambda: later)
+    assert scheduled_post.title in client.get(url).content.decode()
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import SEARCH_TABLE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, text="Обычный текст", **kwargs):
+        kwargs.setdefault("is_published", True)
+        kwargs.setdefault("category", published_category)
+        return mixer.blend(
+            Post, author=user, title=title, text=text,
+            pub_date=timezone.now() - timedelta(days=1), **kwargs)
+    return make
+
+
+def found(text, queryset=None):
+    queryset = Post.objects.all() if queryset is None else queryset
+    return list(queryset.search(text).values_list("title", flat=True))
+
+
+def test_search_matches_title_and_text(make_post):
+    make_post("Горные ПОХОДЫ")
+    make_post("Рецепт", text="Как приготовить борщ в походе")
+    make_post("Другое")
+    assert found("походы") == ["Горные ПОХОДЫ"]
+    assert found("борщ") == ["Рецепт"]
+    assert set(found("поход")) == {"Горные ПОХОДЫ", "Рецепт"}
+    assert found("") == [] and found("!!!") == []
+
+
+def test_search_is_ranked_by_bm25(make_post):
+    make_post("Кофе", text="кофе кофе кофе и ещё раз кофе")
+    make_post("Завтрак", text="Чай, тосты и немного кофе среди прочего")
+    assert found("кофе") == ["Кофе", "Завтрак"]
+
+
+def test_search_input_is_not_fts_syntax(make_post):
+    make_post("Кавычки")
+    assert found('кавычки" OR NEAR(') == []
+    assert found("кавычки AND") == []
+    assert found("КАВЫЧКИ") == ["Кавычки"]
+
+
+def test_index_follows_changes(make_post):
+    post = make_post("Старый заголовок")
+    post.title = "Новый заголовок"
+    post.save()
+    assert found("старый") == []
+    assert found("новый") == ["Новый заголовок"]
+
+    Post.objects.filter(pk=post.pk).update(text="слово из update")
+    assert found("update") == ["Новый заголовок"]
+
+    post.delete()
+    assert found("новый") == []
+
+
+def test_rebuild_command(make_post):
+    make_post("Восстановление")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) "
+            "VALUES ('delete-all')")
+    assert found("восстановление") == []
+    call_command("rebuild_search_index")
+    assert found("восстановление") == ["Восстановление"]
+
+
+def test_search_view_respects_visibility(client, make_post, mixer):
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    make_post("Видимый морской пост")
+    make_post("Снятый морской пост", is_published=False)
+    make_post("Морской пост скрытой категории", category=hidden_category)
+    future = make_post("Будущий морской пост")
+    future.pub_date = timezone.now() + timedelta(days=1)
+    future.save()
+
+    response = client.get("/search/", {"q": "морской"})
+    assert response.status_code == HTTPStatus.OK
+    assert [post.title for post in response.context["page_obj"]] == [
+        "Видимый морской пост"]
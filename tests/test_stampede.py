@@ -0,0 +1,185 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import Client, RequestFactory
+
+from blog import cache as blog_cache
+from blog.cache import (
+    discard_versioned,
+    get_cached_page,
+    get_tag_versions,
+    get_versioned,
+    invalidate_tags,
+    page_cache_key,
+    set_versioned,
+    unlock_versioned,
+)
+from blog.cache_backends import SharedFileCache
+from blog.constant import CACHE_STALE_GRACE
+
+N_THREADS = 8
+REQUESTS_PER_THREAD = 5
+
+
+@pytest.fixture
+def entry():
+    set_versioned("key", "old", get_tag_versions({"tag"}), 60)
+    return "key"
+
+
+def test_fresh_entry_is_read(entry):
+    assert get_versioned(entry) == "old"
+    assert get_versioned(entry) == "old"
+
+
+def test_one_reader_recomputes_invalidated_entry(entry):
+    invalidate_tags("tag")
+    assert get_versioned(entry) is None
+    # Пока первый пересчитывает, остальные получают прежнее значение.
+    assert get_versioned(entry) == "old"
+    assert get_versioned(entry) == "old"
+    set_versioned(entry, "new", get_tag_versions({"tag"}), 60)
+    assert get_versioned(entry) == "new"
+
+
+def test_unlock_lets_next_reader_recompute(entry):
+    invalidate_tags("tag")
+    assert get_versioned(entry) is None
+    unlock_versioned(entry)
+    assert get_versioned(entry) is None
+    assert get_versioned(entry) == "old"
+
+
+def test_discard_drops_entry_and_lock(entry):
+    invalidate_tags("tag")
+    assert get_versioned(entry) is None
+    discard_versioned(entry)
+    assert get_versioned(entry) is None
+    set_versioned(entry, "new", get_tag_versions({"tag"}), 60)
+    assert get_versioned(entry) == "new"
+
+
+def test_expired_entry_is_kept_for_grace(entry, monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(blog_cache.time, "time", lambda: now + 61)
+    assert get_versioned(entry) is None
+    assert get_versioned(entry) == "old"
+    unlock_versioned(entry)
+    monkeypatch.setattr(
+        blog_cache.time, "time", lambda: now + 61 + CACHE_STALE_GRACE)
+    assert get_versioned(entry) is None
+    assert get_versioned(entry) is None
+
+
+def test_shared_file_cache_add_is_atomic(tmp_path):
+    # Отдельные экземпляры с общим каталогом — как кеш разных процессов.
+    backends = [SharedFileCache(tmp_path, {}) for _ in range(N_THREADS)]
+    barrier = threading.Barrier(N_THREADS)
+    added = []
+
+    def add(backend):
+        barrier.wait()
+        added.append(backend.add("lock", threading.get_ident()))
+
+    threads = [
+        threading.Thread(target=add, args=(backend,)) for backend in backends]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(added) == [False] * (N_THREADS - 1) + [True]
+    assert not backends[0].add("lock", "other")
+    backends[0].delete("lock")
+    assert backends[1].add("lock", "other")
+    assert backends[2].get("lock") == "other"
+
+
+@pytest.mark.django_db
+def test_failed_recompute_releases_lock(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    assert client.get(url).status_code == HTTPStatus.OK
+    post_with_published_location.delete()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+def test_single_recompute_under_load(
+        monkeypatch, post_with_published_location):
+    from blog.views import PostListView
+
+    renders = []
+    get_queryset = PostListView.get_queryset
+
+    def slow_get_queryset(view):
+        renders.append(threading.get_ident())
+        time.sleep(0.2)
+        return get_queryset(view)
+
+    monkeypatch.setattr(PostListView, "get_queryset", slow_get_queryset)
+    assert Client().get("/").status_code == HTTPStatus.OK
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    renders.clear()
+
+    barrier = threading.Barrier(N_THREADS)
+    statuses = []
+    titles = []
+
+    def hammer():
+        client = Client()
+        barrier.wait()
+        try:
+            for _ in range(REQUESTS_PER_THREAD):
+                response = client.get("/")
+                statuses.append(response.status_code)
+                titles.append("Новый заголовок" in response.content.decode())
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=hammer) for _ in range(N_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [HTTPStatus.OK] * N_THREADS * REQUESTS_PER_THREAD
+    assert len(renders) == 1
+    # Пока страница пересчитывалась, остальные получали прежнюю копию.
+    assert not all(titles)
+    assert "Новый заголовок" in Client().get("/").content.decode()
+
+
+def stored_page(url):
+    # Два чтения: первое берёт блокировку, второе получило бы
+    # прежнюю копию, пока кто-то пересчитывает страницу.
+    key = page_cache_key(RequestFactory().get(url))
+    return get_cached_page(key) or get_cached_page(key)
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_served_stale(
+        client, user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    assert client.get(url).status_code == HTTPStatus.OK
+    post.is_published = False
+    post.save()
+    # Автор пересчитывает страницу, но она больше не общая.
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    assert stored_page(url) is None
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_deleted_post_is_not_served_stale(
+        client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    assert client.get(url).status_code == HTTPStatus.OK
+    post_with_published_location.delete()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert stored_page(url) is None
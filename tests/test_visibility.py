@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.utils import PostQuerySet
+
+pytestmark = [pytest.mark.django_db]
+
+
+def is_visible(post):
+    return Post.objects.values_list("is_visible", flat=True).get(pk=post.pk)
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1))
+
+
+def test_post_manager_is_post_queryset():
+    assert isinstance(Post.objects.all(), PostQuerySet)
+    assert isinstance(Post.objects.feed().published(), PostQuerySet)
+
+
+def test_visibility_follows_post_fields(post_with_published_location):
+    post = post_with_published_location
+    assert is_visible(post)
+
+    post.is_published = False
+    post.save(update_fields=["is_published"])
+    assert not is_visible(post)
+
+    post.is_published = True
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save()
+    assert not is_visible(post)
+
+
+def test_visibility_follows_category(post_with_published_location):
+    post = post_with_published_location
+    category = post.category
+
+    category.is_published = False
+    category.save()
+    assert not is_visible(post)
+
+    category.is_published = True
+    category.save()
+    assert is_visible(post)
+
+    category.delete()
+    assert not is_visible(post)
+
+
+def test_scheduler_publishes_due_posts(client, scheduled_post):
+    assert not is_visible(scheduled_post)
+    assert scheduled_post.title not in client.get("/").content.decode()
+
+    call_command("publish_scheduled")
+    assert not is_visible(scheduled_post)
+
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - timedelta(hours=1))
+    call_command("publish_scheduled")
+    assert is_visible(scheduled_post)
+    assert scheduled_post.title in client.get("/").content.decode()
+
+
+def test_scheduler_skips_hidden_posts(scheduled_post):
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        is_published=False, pub_date=timezone.now() - timedelta(hours=1))
+    call_command("publish_scheduled")
+    assert not is_visible(scheduled_post)
+
+
+def test_post_for_current_minute_is_visible_at_once(
+        client, mixer, user, published_category):
+    post = mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now().replace(second=0, microsecond=0))
+    assert is_visible(post)
+    assert post.title in client.get("/").content.decode()
+
+
+def test_due_post_published_by_next_request(
+        client, monkeypatch, scheduled_post):
+    assert scheduled_post.title not in client.get("/").content.decode()
+    later = timezone.now() + timedelta(hours=2)
+    monkeypatch.setattr(timezone, "now", lambda: later)
+    assert scheduled_post.title in client.get("/").content.decode()
+    assert is_visible(scheduled_post)